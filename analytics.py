@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+AURA Long-Range Analytics
+Rolling averages, streaks, weekday patterns and mood/progress correlation
+over any span of history, computed with NumPy.
+
+The per-day rollups (mood_daily, progress_daily) are read in chunks into
+day-indexed arrays, one slot per calendar day in the range, so every
+statistic is a handful of vectorized passes however many years are covered.
+
+NumPy is optional: the rest of AURA runs without it, and compute_stats()
+raises RuntimeError when it is missing.
+
+Author: Mark Mikile Mutunga
+Copyright (c) 2025 Mark Mikile Mutunga. All rights reserved.
+
+This software is licensed under the MIT License.
+See the LICENSE file for full license text.
+"""
+
+import datetime
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# How each mood counts towards the daily mood score; 'general' and 'other'
+# carry no sentiment and are left out
+MOOD_SCORES = {
+    'happy': 2, 'excited': 2,
+    'tired': -1, 'unmotivated': -1, 'confused': -1, 'worried': -1,
+    'stressed': -2, 'anxious': -2, 'overwhelmed': -2,
+    'frustrated': -2, 'sad': -2, 'lonely': -2,
+}
+MOODS = tuple(MOOD_SCORES)
+
+WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+DEFAULT_WINDOW = 7
+MAX_WINDOW = 365
+
+# Longest range served, about 20 years; the arrays hold one slot per day
+MAX_RANGE_DAYS = 7305
+
+# Rollup rows fetched per round trip while loading
+CHUNK_SIZE = 5000
+
+
+def available():
+    """Whether NumPy is installed."""
+    return np is not None
+
+
+def parse_day(value):
+    """Parse a YYYY-MM-DD query value into a date (None if empty). Raises ValueError."""
+    if not value:
+        return None
+    return datetime.date.fromisoformat(value)
+
+
+class DailySeries:
+    """
+    One user's history as arrays indexed by day offset from `start`.
+
+    mood_counts is (days, moods) in MOODS order; yes/no/maybe/total are
+    progress check-ins per day; entries counts every mood logged, scored or not.
+    """
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+        length = (end - start).days + 1
+        self.mood_counts = np.zeros((length, len(MOODS)), dtype=np.int64)
+        self.entries = np.zeros(length, dtype=np.int64)
+        self.yes = np.zeros(length, dtype=np.int64)
+        self.no = np.zeros(length, dtype=np.int64)
+        self.maybe = np.zeros(length, dtype=np.int64)
+        self.total = np.zeros(length, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.total)
+
+    def offsets(self, days):
+        """Array offsets of a sequence of YYYY-MM-DD strings."""
+        return (np.array(days, dtype='datetime64[D]') - np.datetime64(self.start, 'D')).astype(np.int64)
+
+    def day_numbers(self):
+        """Days since the Unix epoch for every slot."""
+        first = np.datetime64(self.start, 'D').astype(np.int64)
+        return np.arange(first, first + len(self), dtype=np.int64)
+
+
+def history_bounds(conn, user_id):
+    """(first day, last day) with any mood or progress for the user, as dates, or None."""
+    row = conn.execute('''
+        SELECT MIN(first), MAX(last) FROM (
+            SELECT MIN(day) AS first, MAX(day) AS last FROM mood_daily WHERE user_id = ?
+            UNION ALL
+            SELECT MIN(day), MAX(day) FROM progress_daily WHERE user_id = ?
+        )
+    ''', (user_id, user_id)).fetchone()
+    if row is None or row[0] is None:
+        return None
+    return datetime.date.fromisoformat(row[0]), datetime.date.fromisoformat(row[1])
+
+
+def load_series(conn, user_id, start, end, chunk_size=CHUNK_SIZE):
+    """Read the user's rollup rows between start and end (inclusive) into a DailySeries."""
+    series = DailySeries(start, end)
+    mood_index = {mood: i for i, mood in enumerate(MOODS)}
+    bounds = (user_id, start.isoformat(), end.isoformat())
+
+    cursor = conn.execute('''
+        SELECT day, mood, count FROM mood_daily
+        WHERE user_id = ? AND day BETWEEN ? AND ?
+    ''', bounds)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        days, moods, counts = zip(*rows)
+        offsets = series.offsets(days)
+        counts = np.array(counts, dtype=np.int64)
+        np.add.at(series.entries, offsets, counts)
+
+        # Unscored moods only count as entries
+        columns = np.array([mood_index.get(mood, -1) for mood in moods], dtype=np.int64)
+        scored = columns >= 0
+        np.add.at(series.mood_counts, (offsets[scored], columns[scored]), counts[scored])
+
+    cursor = conn.execute('''
+        SELECT day, yes_count, no_count, maybe_count, total FROM progress_daily
+        WHERE user_id = ? AND day BETWEEN ? AND ?
+    ''', bounds)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        block = np.array([row[1:] for row in rows], dtype=np.int64)
+        # One progress_daily row per user and day, so plain assignment will do
+        offsets = series.offsets([row[0] for row in rows])
+        series.yes[offsets], series.no[offsets], series.maybe[offsets], series.total[offsets] = block.T
+
+    return series
+
+
+def rolling_sum(values, window):
+    """Trailing sum over `window` days (fewer at the start of the range)."""
+    cumulative = np.concatenate(([0], np.cumsum(values, dtype=np.float64)))
+    index = np.arange(1, len(values) + 1)
+    return cumulative[index] - cumulative[np.maximum(index - window, 0)]
+
+
+def ratio(numerator, denominator):
+    """numerator / denominator element-wise, NaN where the denominator is 0."""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    result = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+
+def streaks(active):
+    """(current, longest) run of consecutive True days; current is the run ending on the last day."""
+    if not len(active):
+        return 0, 0
+    edges = np.diff(np.concatenate(([0], active.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if not len(starts):
+        return 0, 0
+    lengths = ends - starts
+    current = int(lengths[-1]) if active[-1] else 0
+    return current, int(lengths.max())
+
+
+def correlation(x, y):
+    """Pearson correlation of two arrays, or NaN with fewer than 3 points or no variance."""
+    if len(x) < 3 or x.std() == 0 or y.std() == 0:
+        return np.nan
+    return float(np.corrcoef(x, y)[0, 1])
+
+
+def _rounded(values, digits=3):
+    """JSON-ready list: floats rounded, NaN as None."""
+    values = np.round(np.asarray(values, dtype=np.float64), digits)
+    return [None if np.isnan(value) else value for value in values.tolist()]
+
+
+def _number(value, digits=3):
+    """JSON-ready number: rounded, NaN as None."""
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def summarize(series, window=DEFAULT_WINDOW):
+    """Every long-range statistic for a DailySeries, as a JSON-ready dict."""
+    scores = np.array([MOOD_SCORES[mood] for mood in MOODS], dtype=np.float64)
+    scored = series.mood_counts.sum(axis=1)
+    score_sum = series.mood_counts @ scores
+
+    # Rolling averages: mood score per scored entry, share of check-ins answered 'yes'
+    rolling_mood = ratio(rolling_sum(score_sum, window), rolling_sum(scored, window))
+    rolling_completion = ratio(rolling_sum(series.yes, window), rolling_sum(series.total, window))
+
+    goal_current, goal_longest = streaks(series.yes > 0)
+    log_current, log_longest = streaks((series.total > 0) | (series.entries > 0))
+
+    # Weekday patterns (the epoch, day 0, was a Thursday)
+    weekday = (series.day_numbers() + 3) % 7
+    by_weekday = {
+        name: np.bincount(weekday, weights=values, minlength=7)
+        for name, values in (('score', score_sum), ('scored', scored), ('yes', series.yes),
+                             ('total', series.total), ('entries', series.entries))
+    }
+    weekday_mood = ratio(by_weekday['score'], by_weekday['scored'])
+    weekday_completion = ratio(by_weekday['yes'], by_weekday['total'])
+
+    # Correlation over days with both a scored mood and a progress check-in
+    both = (scored > 0) & (series.total > 0)
+    daily_mood = score_sum[both] / scored[both]
+    daily_completion = series.yes[both] / series.total[both]
+
+    # Completion rate on the days each mood was logged
+    logged = (series.mood_counts > 0) & (series.total > 0)[:, None]
+    completion_by_mood = ratio(logged.T @ series.yes, logged.T @ series.total)
+
+    return {
+        'start': series.start.isoformat(),
+        'end': series.end.isoformat(),
+        'window': window,
+        'days': len(series),
+        'rolling': {
+            'mood': _rounded(rolling_mood),
+            'completion': _rounded(rolling_completion),
+        },
+        'streaks': {
+            'goal': {'current': goal_current, 'longest': goal_longest},
+            'logging': {'current': log_current, 'longest': log_longest},
+        },
+        'weekdays': [
+            {
+                'day': WEEKDAYS[i],
+                'mood': _number(weekday_mood[i]),
+                'completion': _number(weekday_completion[i]),
+                'entries': int(by_weekday['entries'][i]),
+                'check_ins': int(by_weekday['total'][i]),
+            }
+            for i in range(7)
+        ],
+        'correlation': {
+            'mood_vs_completion': _number(correlation(daily_mood, daily_completion)),
+            'days': int(both.sum()),
+            'completion_by_mood': {
+                mood: _number(rate) for mood, rate in zip(MOODS, completion_by_mood) if not np.isnan(rate)
+            },
+        },
+        'totals': {
+            'mood_entries': int(series.entries.sum()),
+            'check_ins': int(series.total.sum()),
+            'yes': int(series.yes.sum()),
+            'no': int(series.no.sum()),
+            'maybe': int(series.maybe.sum()),
+        },
+    }
+
+
+def compute_stats(conn, user_id, start=None, end=None, window=DEFAULT_WINDOW):
+    """
+    Long-range statistics for one user between start and end (dates, inclusive).
+    start defaults to the user's first entry and end to today.
+    """
+    if np is None:
+        raise RuntimeError("Long-range analytics need NumPy: pip install numpy")
+
+    end = end or datetime.date.today()
+    if start is None:
+        bounds = history_bounds(conn, user_id)
+        start = min(bounds[0], end) if bounds else end
+    if start > end:
+        raise ValueError("start must not be after end")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise ValueError(f"Range is limited to {MAX_RANGE_DAYS} days")
+    if not 1 <= window <= MAX_WINDOW:
+        raise ValueError(f"window must be between 1 and {MAX_WINDOW}")
+
+    return summarize(load_series(conn, user_id, start, end), window)
@@ -23,7 +23,7 @@ See the LICENSE file for full license text.
 # See LICENSE file for details
 #==============================================================================
 
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, render_template, request, jsonify, session, Response, stream_with_context, g
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 import sqlite3
@@ -32,18 +32,69 @@ import re
 import random
 import os
 import atexit
+import json
+import math
+import hashlib
+import uuid
+import queue
+import time
 
 # Import the AURA class from our existing module
-from aura import AURA
+from aura import AURA, DEFAULT_USER, PAGE_TABLES, SEARCH_TABLES, live_streak
+from cache import ResultCache
+from broker import ReminderBroker, KEEPALIVE_INTERVAL, sse_event, sse_keepalive
+import metrics
+from metrics import CHAT_LATENCY, QUERY_LATENCY, REQUEST_LATENCY, JOB_DURATION, Gauge
+from scheduler import SchedulerLease, ReminderWatcher, run_due_reminders, JOB_INTERVAL
+from exporter import EXPORT_TABLES, CONTENT_TYPES, export_stream, parse_bound
+from retention import RETENTION_INTERVAL, apply_retention, parse_policy
+from backup import BACKUP_INTERVAL, KEEP_BACKUPS, run_backup
+import analytics
 
 app = Flask(__name__)
 app.secret_key = 'aura-web-secret-key-2025'  # Required for sessions
 
-# Initialize the background scheduler
+# Most goals / pending reminders written into a chat message; the rest are
+# available page by page from /api/goals and /api/reminders
+GOALS_SHOWN = 20
+REMINDERS_SHOWN = 10
+
+# Tables each analytics result depends on, for cache invalidation
+MOOD_TABLES = ('moods',)
+PROGRESS_TABLES = ('progress', 'goals')
+
+# Most messages accepted by one /chat/batch request
+MAX_BATCH_MESSAGES = 500
+
+def parse_message_time(value):
+    """
+    Parse a batch message's timestamp (ISO 8601 text or epoch seconds) into
+    a local datetime, or None when missing. Raises ValueError.
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"Invalid timestamp {value!r}")
+    # Reject NaN, infinities, pre-1970 epochs and dates that can't be
+    # converted to local time as bad input
+    if not isinstance(value, str) and (not math.isfinite(value) or value < 0):
+        raise ValueError("Invalid timestamp")
+    try:
+        if isinstance(value, str):
+            when = datetime.datetime.fromisoformat(value)
+            # Stored timestamps are local time without an offset, like datetime.now()
+            return when.astimezone().replace(tzinfo=None) if when.tzinfo else when
+        return datetime.datetime.fromtimestamp(value)
+    except (OverflowError, OSError, ValueError):
+        raise ValueError("Invalid timestamp")
+
+
+# Initialize the background scheduler. Every worker process runs one, but the
+# reminder job itself only runs in whichever process holds the database lease.
+# Set AURA_EMBEDDED_SCHEDULER=0 when reminders come from `python scheduler.py`.
+EMBEDDED_SCHEDULER = os.environ.get('AURA_EMBEDDED_SCHEDULER', '1') != '0'
 scheduler = BackgroundScheduler()
 scheduler.start()
-# Shut down the scheduler when exiting the app
-atexit.register(lambda: scheduler.shutdown())
 
 class WebAURA(AURA):
     """
@@ -51,16 +102,25 @@ class WebAURA(AURA):
     Inherits all functionality from AURA but modifies interactive methods.
     """
     
-    def __init__(self):
+    def __init__(self, **kwargs):
         """Initialize WebAURA with all AURA functionality."""
-        super().__init__()
+        super().__init__(**kwargs)
         # Track if this is the user's first interaction
         self.first_interaction = True
+        # Dashboard analytics cache, invalidated by _data_changed(); writes from
+        # other processes show up once the TTL runs out
+        self.analytics_cache = ResultCache(ttl=60)
+        # Formatted goal lists for chat, keyed by a goals version so writes from
+        # other processes are seen too
+        self.goal_summary_cache = ResultCache(ttl=600, max_entries=4096)
+        # Open reminder streams, fed by the scheduler via _reminder_created()
+        self.reminder_broker = ReminderBroker()
     
-    def process_message(self, user_input):
+    def process_message(self, user_input, when=None):
         """
         Process a user message and return AURA's response.
         This replaces the terminal-based run() method for web interface.
+        A goal or mood in the message is saved as of when (default now).
         """
         user_input = user_input.strip()
         
@@ -75,10 +135,10 @@ class WebAURA(AURA):
         
         # Check if it's a goal
         if self.detect_goal(user_input):
-            return self.add_goal(user_input)
+            return self.add_goal(user_input, when)
         
         # Check if it's a mood
-        mood_response = self.detect_mood(user_input)
+        mood_response = self.detect_mood(user_input, when)
         if mood_response:
             return mood_response
         
@@ -92,22 +152,180 @@ class WebAURA(AURA):
         ]
         return random.choice(responses)
     
-    def get_goals_display(self):
-        """Get formatted goals display for web interface."""
-        goals = self.get_goals()
+    def process_messages(self, messages):
+        """
+        Process a list of (text, when) messages in order, in one transaction,
+        and return AURA's responses in the same order. Used to replay
+        messages queued on offline devices; when (a local datetime or None)
+        is when each was originally sent.
+        """
+        try:
+            with CHAT_LATENCY.time('batch'):
+                with self.db.transaction(immediate=True):
+                    return [self.process_message(text, when) for text, when in messages]
+        finally:
+            # Again after the commit (or rollback), so nothing cached mid-batch survives
+            self._data_changed('goals', 'moods')
+    
+    def get_batch_results(self, data):
+        """
+        Build the /chat/batch response from its JSON body:
+        {"messages": [{"message": "...", "timestamp": "2025-01-01T08:30:00"}, ...]},
+        where a message can also be a plain string and timestamp is optional
+        (ISO 8601 or epoch seconds). Raises ValueError for a bad body.
+        """
+        items = data.get('messages') if isinstance(data, dict) else None
+        if not isinstance(items, list) or not items:
+            raise ValueError("Expected a non-empty 'messages' list")
+        if len(items) > MAX_BATCH_MESSAGES:
+            raise ValueError(f"At most {MAX_BATCH_MESSAGES} messages per batch")
+        
+        messages = []
+        for index, item in enumerate(items):
+            if isinstance(item, str):
+                item = {'message': item}
+            if not isinstance(item, dict) or not isinstance(item.get('message'), str):
+                raise ValueError(f"Message {index} has no 'message' text")
+            try:
+                messages.append((item['message'], parse_message_time(item.get('timestamp'))))
+            except ValueError as e:
+                raise ValueError(f"Message {index}: {e}")
+        
+        return {'success': True, 'responses': self.process_messages(messages)}
+    
+    def respond(self, user_message, first_message=False):
+        """
+        Build the chat reply for a message. On a session's first message the
+        initial greeting comes first, but the message is still processed.
+        """
+        if not first_message:
+            with CHAT_LATENCY.time('message'):
+                return self.process_message(user_message)
+        
+        with CHAT_LATENCY.time('first_message'):
+            initial_greeting = self.get_initial_greeting()
+            user_response = self.process_message(user_message)
+        
+        # Combine greeting and response
+        return f"{initial_greeting}\n\n---\n\nYou said: \"{user_message}\"\n\n{user_response}"
+    
+    def format_reminder(self, reminder_id, message, created_at, goal_text):
+        """Shape a reminder row for the chat interface."""
+        try:
+            date_obj = datetime.datetime.fromisoformat(created_at)
+            formatted_time = date_obj.strftime("%I:%M %p")
+        except:
+            formatted_time = "Recently"
+        
+        return {
+            'id': reminder_id,
+            'message': message,
+            'time': formatted_time,
+            'goal': goal_text
+        }
+    
+    def collect_reminders(self):
+        """Claim unread reminders and return them formatted for display."""
+        return [self.format_reminder(*row) for row in self.claim_reminders()]
+    
+    def _reminder_created(self, reminder_id, message, created_at, goal_text):
+        """Push a new reminder to the user's open tabs, claiming it first."""
+        if not self.reminder_broker.has_subscribers(self.user_id):
+            return  # Stays unread until a tab connects or polls
         
-        if goals:
-            result = "🎯 Here are your current goals:\n\n"
-            for i, (goal, date_added) in enumerate(goals, 1):
+        for row in self.claim_reminders(reminder_id=reminder_id):
+            self.reminder_broker.publish(self.user_id, self.format_reminder(*row))
+    
+    def get_api_page(self, table, args):
+        """
+        Build the /api/<table> response from its query parameters:
+        limit (1-200, default 50), cursor (next_cursor from the previous
+        page), start/end=YYYY-MM-DD, status (goals, default active; progress)
+        and unread=1 (reminders). Raises ValueError for bad parameters.
+        """
+        filters = {}
+        if table == 'goals':
+            filters['status'] = args.get('status', 'active')
+        elif table == 'progress' and args.get('status'):
+            filters['status'] = args['status']
+        elif table == 'reminders' and args.get('unread') == '1':
+            filters['is_read'] = 0
+        
+        limit = min(max(int(args.get('limit', 50)), 1), 200)
+        items, next_cursor = self.get_page(
+            table, limit, args.get('cursor'),
+            parse_bound(args.get('start')), parse_bound(args.get('end')),
+            **filters
+        )
+        return {'success': True, 'items': items, 'next_cursor': next_cursor}
+    
+    def get_search_results(self, args):
+        """
+        Build the /search response from its query parameters: q (required),
+        table (goals or moods, default both), start/end=YYYY-MM-DD and
+        limit (1-100, default 20). Raises ValueError for bad parameters.
+        """
+        query = args.get('q', '').strip()
+        if not query:
+            raise ValueError("Missing search query")
+        
+        table = args.get('table')
+        if table is not None and table not in SEARCH_TABLES:
+            raise ValueError(f"Unknown table {table!r}")
+        
+        limit = min(max(int(args.get('limit', 20)), 1), 100)
+        items = self.search(
+            query, (table,) if table else tuple(SEARCH_TABLES), limit,
+            parse_bound(args.get('start')), parse_bound(args.get('end'))
+        )
+        return {'success': True, 'items': items}
+    
+    def get_goal_summary(self):
+        """
+        The user's most recent goals, formatted for chat, as (text, count).
+        Cached until the user's goals change, so the first message of a
+        session doesn't re-read and re-format them. The cache key includes
+        the active goals' highest id and count, so goals added or closed by
+        another worker, the importer or the scheduler show up at once.
+        """
+        def build():
+            goals = self.get_goals(limit=GOALS_SHOWN + 1)
+            text = ""
+            for i, (goal, date_added) in enumerate(goals[:GOALS_SHOWN], 1):
                 try:
                     date_obj = datetime.datetime.fromisoformat(date_added)
                     formatted_date = date_obj.strftime("%B %d, %Y")
                 except:
                     formatted_date = "Recently"
                 
-                result += f"{i}. {goal}\n"
-                result += f"   📅 Added on {formatted_date}\n\n"
-            return result
+                text += f"{i}. {goal}\n"
+                text += f"   📅 Added on {formatted_date}\n\n"
+            
+            if len(goals) > GOALS_SHOWN:
+                text += f"…plus older goals. These are your {GOALS_SHOWN} most recent.\n\n"
+            return text, len(goals)
+        
+        return self.goal_summary_cache.get_or_compute(
+            ('goal_summary', self.user_id, self.get_goals_version()), self._cache_tags(('goals',)), build
+        )
+    
+    def get_goals_version(self):
+        """(highest id, count) of the user's active goals: a cheap, index-only change marker."""
+        try:
+            with self.db.connection() as conn:
+                return conn.execute(
+                    "SELECT MAX(id), COUNT(*) FROM goals WHERE user_id = ? AND status = 'active'",
+                    (self.user_id,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+    
+    def get_goals_display(self):
+        """Get formatted goals display for web interface (the most recent GOALS_SHOWN)."""
+        summary, count = self.get_goal_summary()
+        
+        if count:
+            return "🎯 Here are your current goals:\n\n" + summary
         else:
             return "📋 You don't have any goals yet. Tell me something you want to achieve!"
     
@@ -116,38 +334,22 @@ class WebAURA(AURA):
         greeting = "🤖 Welcome to AURA - Your Adaptive Understanding & Reflective Assistant!\n\n"
         
         # Check for pending reminders first
-        reminders = self.get_unread_reminders()
+        # (claimed and marked delivered in one transaction)
+        reminders = self.claim_reminders(limit=REMINDERS_SHOWN)
         if reminders:
             greeting += "🔔 You have pending reminders:\n\n"
-            for reminder_id, message, created_at, goal_text in reminders:
-                try:
-                    date_obj = datetime.datetime.fromisoformat(created_at)
-                    formatted_time = date_obj.strftime("%I:%M %p")
-                except:
-                    formatted_time = "Recently"
-                
-                greeting += f"• {message}\n"
-                greeting += f"  📅 {formatted_time}\n\n"
-                
-                # Mark reminder as read since we're showing it
-                self.mark_reminder_read(reminder_id)
+            for row in reminders:
+                reminder = self.format_reminder(*row)
+                greeting += f"• {reminder['message']}\n"
+                greeting += f"  📅 {reminder['time']}\n\n"
             
             greeting += "---\n\n"
         
         # Show goals if they exist
-        goals = self.get_goals()
-        if goals:
+        summary, count = self.get_goal_summary()
+        if count:
             greeting += "🎯 Welcome back! Here are your current goals:\n\n"
-            for i, (goal, date_added) in enumerate(goals, 1):
-                try:
-                    date_obj = datetime.datetime.fromisoformat(date_added)
-                    formatted_date = date_obj.strftime("%B %d, %Y")
-                except:
-                    formatted_date = "Recently"
-                
-                greeting += f"{i}. {goal}\n"
-                greeting += f"   📅 Added on {formatted_date}\n\n"
-            
+            greeting += summary
             greeting += "💭 These goals are here to guide and motivate you today!\n\n"
         else:
             greeting += "📋 I don't see any goals yet. Tell me something you want to achieve!\n\n"
@@ -161,146 +363,399 @@ class WebAURA(AURA):
         
         return greeting
 
-    def get_mood_analytics(self):
+    def _data_changed(self, *tables):
+        """Drop this user's cached analytics and goal lists that read any of the written tables."""
+        tags = self._cache_tags(tables)
+        self.analytics_cache.invalidate(*tags)
+        self.goal_summary_cache.invalidate(*tags)
+
+    def _cache_tags(self, tables):
+        """Cache dependency tags: one per (table, user), so users don't invalidate each other."""
+        return tuple((table, self.user_id) for table in tables)
+
+    def get_mood_analytics(self, days=30):
         """
         Fetch mood data from database and prepare for charting.
-        Returns mood counts by type and mood trends over time.
+        Returns mood counts by type and mood trends over the last `days` days.
         """
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
+            self.flush_writes()
+            return self.analytics_cache.get_or_compute(
+                ('mood_analytics', self.user_id, days), self._cache_tags(MOOD_TABLES),
+                lambda: self._query_mood_analytics(days)
+            )
             
+        except sqlite3.Error as e:
+            print(f"❌ Error fetching mood analytics: {e}")
+            return {'mood_counts': [], 'mood_trends': [], 'total_entries': 0}
+
+    @QUERY_LATENCY.timed
+    def _query_mood_analytics(self, days):
+        """Run the mood analytics queries against the daily rollup."""
+        since_day = (datetime.date.today() - datetime.timedelta(days=days)).isoformat()
+        
+        # Everything is read from the mood_daily rollup, kept current by a trigger
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+        
             # Get mood counts by type for pie/doughnut chart
             cursor.execute('''
-                SELECT mood, COUNT(*) as count 
-                FROM moods 
-                WHERE mood != 'general' AND mood != 'other'
+                SELECT mood, SUM(count) as count 
+                FROM mood_daily 
+                WHERE user_id = ?
+                AND mood != 'general' AND mood != 'other'
                 GROUP BY mood 
                 ORDER BY count DESC
-            ''')
+            ''', (self.user_id,))
             mood_counts = cursor.fetchall()
-            
-            # Get mood trends over time (last 30 days)
+        
+            # Get mood trends over time (last `days` days)
             cursor.execute('''
-                SELECT DATE(date_logged) as date, mood, COUNT(*) as count
-                FROM moods 
-                WHERE date_logged >= datetime('now', '-30 days')
+                SELECT day as date, mood, count
+                FROM mood_daily 
+                WHERE user_id = ? AND day >= ?
                 AND mood != 'general' AND mood != 'other'
-                GROUP BY DATE(date_logged), mood
                 ORDER BY date DESC
-            ''')
+            ''', (self.user_id, since_day))
             mood_trends = cursor.fetchall()
-            
+        
             # Get total mood entries
-            cursor.execute('SELECT COUNT(*) FROM moods')
+            cursor.execute('SELECT COALESCE(SUM(count), 0) FROM mood_daily WHERE user_id = ?', (self.user_id,))
             total_moods = cursor.fetchone()[0]
-            
-            conn.close()
-            
-            return {
-                'mood_counts': mood_counts,
-                'mood_trends': mood_trends,
-                'total_entries': total_moods
-            }
-            
-        except sqlite3.Error as e:
-            print(f"❌ Error fetching mood analytics: {e}")
-            return {'mood_counts': [], 'mood_trends': [], 'total_entries': 0}
+        
+        return {
+            'mood_counts': mood_counts,
+            'mood_trends': mood_trends,
+            'total_entries': total_moods
+        }
 
-    def get_goal_progress_analytics(self):
+    def get_goal_progress_analytics(self, days=30):
         """
         Fetch goal progress data from database and prepare for charting.
         Returns progress statistics for each goal.
         """
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
+            self.flush_writes()
+            return self.analytics_cache.get_or_compute(
+                ('goal_progress_analytics', self.user_id, days), self._cache_tags(PROGRESS_TABLES),
+                lambda: self._query_goal_progress_analytics(days)
+            )
             
-            # Get progress data grouped by goal with yes/no counts
+        except sqlite3.Error as e:
+            print(f"❌ Error fetching goal progress analytics: {e}")
+            return {'goal_progress': [], 'progress_trends': [], 'total_progress_entries': 0}
+
+    @QUERY_LATENCY.timed
+    def _query_goal_progress_analytics(self, days):
+        """Run the goal progress queries."""
+        since_day = (datetime.date.today() - datetime.timedelta(days=days)).isoformat()
+        
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
+        
+            # Per-goal counters and streaks, kept current by the progress trigger:
+            # one goal_stats lookup per active goal, however long the history
             cursor.execute('''
                 SELECT 
                     g.goal_text,
-                    SUM(CASE WHEN p.status = 'yes' THEN 1 ELSE 0 END) as yes_count,
-                    SUM(CASE WHEN p.status = 'no' THEN 1 ELSE 0 END) as no_count,
-                    SUM(CASE WHEN p.status = 'maybe' THEN 1 ELSE 0 END) as maybe_count,
-                    COUNT(p.id) as total_checks
+                    COALESCE(s.yes_count, 0) as yes_count,
+                    COALESCE(s.no_count, 0) as no_count,
+                    COALESCE(s.maybe_count, 0) as maybe_count,
+                    COALESCE(s.total, 0) as total_checks,
+                    COALESCE(s.current_streak, 0) as current_streak,
+                    COALESCE(s.longest_streak, 0) as longest_streak,
+                    s.last_check_in,
+                    s.last_yes_day
                 FROM goals g
-                LEFT JOIN progress p ON g.id = p.goal_id
-                WHERE g.status = 'active'
-                GROUP BY g.id, g.goal_text
+                LEFT JOIN goal_stats s ON s.goal_id = g.id
+                WHERE g.user_id = ? AND g.status = 'active'
                 ORDER BY total_checks DESC
-            ''')
-            goal_progress = cursor.fetchall()
-            
-            # Get progress trends over time (last 30 days)
+            ''', (self.user_id,))
+            # (goal, yes, no, maybe, total, current streak, longest streak, last check-in)
+            goal_progress = [
+                (*row[:5], live_streak(row[5], row[8]), row[6], row[7])
+                for row in cursor.fetchall()
+            ]
+        
+            # Get progress trends over time (last `days` days) from the daily rollup
             cursor.execute('''
-                SELECT 
-                    DATE(p.created_at) as date,
-                    SUM(CASE WHEN p.status = 'yes' THEN 1 ELSE 0 END) as yes_count,
-                    SUM(CASE WHEN p.status = 'no' THEN 1 ELSE 0 END) as no_count
-                FROM progress p
-                WHERE p.created_at >= datetime('now', '-30 days')
-                GROUP BY DATE(p.created_at)
+                SELECT day as date, yes_count, no_count
+                FROM progress_daily
+                WHERE user_id = ? AND day >= ?
                 ORDER BY date DESC
-            ''')
+            ''', (self.user_id, since_day))
             progress_trends = cursor.fetchall()
-            
+        
             # Get total progress entries
-            cursor.execute('SELECT COUNT(*) FROM progress')
+            cursor.execute('SELECT COALESCE(SUM(total), 0) FROM progress_daily WHERE user_id = ?', (self.user_id,))
             total_progress = cursor.fetchone()[0]
-            
-            conn.close()
-            
-            return {
-                'goal_progress': goal_progress,
-                'progress_trends': progress_trends,
-                'total_progress_entries': total_progress
-            }
+        
+        return {
+            'goal_progress': goal_progress,
+            'progress_trends': progress_trends,
+            'total_progress_entries': total_progress
+        }
+
+    def get_long_range_stats(self, start=None, end=None, window=analytics.DEFAULT_WINDOW):
+        """
+        Rolling averages, streaks, weekday patterns and mood/progress
+        correlation between start and end (dates; default: all history up
+        to today). See analytics.compute_stats. Raises ValueError for a bad
+        range; without NumPy, returns {'available': False, 'error': ...}.
+        """
+        if not analytics.available():
+            return {'available': False, 'error': 'Long-range analytics need NumPy (pip install numpy)'}
+        
+        # Resolve "today" before caching, so the entry doesn't outlive the day
+        end = end or datetime.date.today()
+        
+        try:
+            self.flush_writes()
+            return self.analytics_cache.get_or_compute(
+                ('long_range', self.user_id, start, end, window),
+                self._cache_tags(MOOD_TABLES + PROGRESS_TABLES),
+                lambda: self._query_long_range_stats(start, end, window)
+            )
             
         except sqlite3.Error as e:
-            print(f"❌ Error fetching goal progress analytics: {e}")
-            return {'goal_progress': [], 'progress_trends': [], 'total_progress_entries': 0}
+            print(f"❌ Error computing long-range analytics: {e}")
+            return {'available': False, 'error': str(e)}
+
+    @QUERY_LATENCY.timed
+    def _query_long_range_stats(self, start, end, window):
+        """Load the daily rollups into arrays and compute the statistics."""
+        with self.db.connection() as conn:
+            stats = analytics.compute_stats(conn, self.user_id, start, end, window)
+        stats['available'] = True
+        return stats
+
+    def get_dashboard_data(self, days=30, stats=None):
+        """
+        Build the /data payload and an ETag for it.
+        stats, a (start, end, window) tuple, adds the long-range statistics.
+        Both are cached until a mood, progress or goal write invalidates them.
+        """
+        def build():
+            payload = {
+                'success': True,
+                'mood_data': self.get_mood_analytics(days),
+                'progress_data': self.get_goal_progress_analytics(days)
+            }
+            if stats is not None:
+                payload['long_range'] = self.get_long_range_stats(*stats)
+            body = json.dumps(payload, sort_keys=True, default=str)
+            return payload, hashlib.sha1(body.encode('utf-8')).hexdigest()
+
+        self.flush_writes()
+        return self.analytics_cache.get_or_compute(
+            ('dashboard', self.user_id, days, stats), self._cache_tags(MOOD_TABLES + PROGRESS_TABLES), build
+        )
 
 
 # Create a global WebAURA instance
-web_aura = WebAURA()
+# Set AURA_DB to use a database file other than aura_memory.db, and
+# AURA_WRITE_BEHIND=1 to batch mood and progress inserts off the request path
+web_aura = WebAURA(
+    db_name=os.environ.get('AURA_DB', 'aura_memory.db'),
+    write_behind=os.environ.get('AURA_WRITE_BEHIND') == '1'
+)
+
+# Set AURA_MULTI_USER=1 to give every browser session its own goals and moods.
+# Otherwise everyone shares the single default user, as before.
+MULTI_USER = os.environ.get('AURA_MULTI_USER') == '1'
+
+def current_user_id():
+    """Map the Flask session to a user ID, creating one on first visit."""
+    if not MULTI_USER:
+        return DEFAULT_USER
+    if 'user_id' not in session:
+        session['user_id'] = uuid.uuid4().hex
+        session.permanent = True
+    return session['user_id']
+
+def current_aura():
+    """WebAURA scoped to the user making this request."""
+    return web_aura.for_user(current_user_id())
+
+_shut_down = False
+
+def shutdown():
+    """
+    Stop the scheduler, flush queued writes and close connections when exiting
+    the app. Safe to call twice (the ASGI lifespan handler and atexit both do).
+    """
+    global _shut_down
+    if _shut_down:
+        return
+    _shut_down = True
+    
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    reminder_lease.release()
+    retention_lease.release()
+    backup_lease.release()
+    web_aura.close()
+
+atexit.register(shutdown)
+
+# Scrape-time gauges for /metrics
+Gauge('aura_db_connections', "Database connections by state",
+      lambda: {(state,): web_aura.db.stats()[state] for state in ('pooled', 'in_use')}, labels=('state',))
+Gauge('aura_db_connections_opened_total', "Database connections opened",
+      lambda: web_aura.db.stats()['opened_total'], kind='counter')
+Gauge('aura_db_checkouts_total', "Database connection checkouts",
+      lambda: web_aura.db.stats()['checkouts_total'], kind='counter')
+Gauge('aura_write_behind_pending', "Inserts queued for the write-behind flusher",
+      lambda: web_aura.writes.pending() if web_aura.writes is not None else 0)
+Gauge('aura_reminder_streams', "Open reminder event streams in this process",
+      web_aura.reminder_broker.subscriber_count)
 
 # =============================================================================
 # SCHEDULER FUNCTIONS FOR DAILY REMINDERS
 # =============================================================================
 
+# Only the lease holder among all processes creates reminders
+reminder_lease = SchedulerLease(web_aura.db, 'reminders')
+
+# Pushes reminders created in other processes to this process's open streams
+reminder_watcher = ReminderWatcher(web_aura)
+
+# Set AURA_RETENTION=1 (or a policy such as "moods=180,reminders=7") to archive
+# old rows and compact the database every hour; see retention.py
+RETENTION_SETTING = os.environ.get('AURA_RETENTION', '0')
+RETENTION_POLICY = None if RETENTION_SETTING == '0' else parse_policy(RETENTION_SETTING)
+retention_lease = SchedulerLease(web_aura.db, 'retention', ttl=RETENTION_INTERVAL * 2.5)
+
+# Set AURA_BACKUP_DIR to take a verified online backup there once a day,
+# keeping the newest AURA_BACKUP_KEEP (default 7); see backup.py
+BACKUP_DIR = os.environ.get('AURA_BACKUP_DIR')
+BACKUP_KEEP = int(os.environ.get('AURA_BACKUP_KEEP', KEEP_BACKUPS))
+backup_lease = SchedulerLease(web_aura.db, 'backup', ttl=BACKUP_INTERVAL * 1.5)
+
 def create_daily_reminder_job():
     """
     Scheduled job function that creates daily reminders.
-    This runs in the background and generates reminder messages for users' goals.
+    This runs in the background and creates a reminder for every goal whose
+    schedule has come due (each goal is reminded once a day by default).
     """
     try:
-        print("🔔 Running daily reminder job...")
-        
-        # Create a reminder using the global AURA instance
-        success = web_aura.create_daily_reminder()
+        # Runs every minute, so stay quiet unless something was due
+        with JOB_DURATION.time('reminders'):
+            created = run_due_reminders(web_aura, reminder_lease)
         
-        if success:
-            print("✅ Daily reminder created successfully!")
-        else:
-            print("ℹ️  No goals found or reminder creation failed.")
+        if created:
+            print(f"🔔 Created {created} scheduled reminder(s)!")
             
     except Exception as e:
         print(f"❌ Error in daily reminder job: {e}")
 
-# Schedule the daily reminder job
-# For testing: runs every 2 minutes
-# For production: change to every 24 hours using cron trigger
+def watch_reminders_job():
+    """Scheduled job that pushes reminders created by other processes."""
+    # The lease holder creates reminders itself and publishes them to its
+    # streams directly, so it has nothing to poll for
+    if reminder_lease.held():
+        return
+    
+    try:
+        with JOB_DURATION.time('reminder_watcher'):
+            reminder_watcher.poll()
+    except Exception as e:
+        print(f"❌ Error in reminder watcher job: {e}")
+
+def retention_job():
+    """Scheduled job that archives old rows and compacts the database, in one process."""
+    try:
+        if not retention_lease.acquire():
+            return
+        
+        with JOB_DURATION.time('retention'):
+            result = apply_retention(web_aura.db, RETENTION_POLICY)
+        
+        if any(result['archived'].values()) or result['deleted_reminders']:
+            print(f"🗄️  Retention: archived {result['archived']}, "
+                  f"deleted {result['deleted_reminders']} read reminder(s)")
+            
+    except Exception as e:
+        print(f"❌ Error in retention job: {e}")
+
+def backup_job():
+    """Scheduled job that backs the database up without blocking writes, in one process."""
+    try:
+        if not backup_lease.acquire():
+            return
+        
+        with JOB_DURATION.time('backup'):
+            result = run_backup(web_aura.db.db_name, BACKUP_DIR, BACKUP_KEEP)
+        
+        print(f"💾 Backed up the database to {result['path']} in {result['seconds']:.1f}s")
+        
+    except Exception as e:
+        print(f"❌ Error in backup job: {e}")
+
+# Schedule the reminder job. It only looks at schedules that are due, so it is
+# cheap to run often; each goal's own interval decides how often it is reminded.
+if EMBEDDED_SCHEDULER:
+    scheduler.add_job(
+        func=create_daily_reminder_job,
+        trigger=IntervalTrigger(seconds=JOB_INTERVAL),
+        id='daily_reminder_job',
+        name='Create due goal reminders',
+        replace_existing=True
+    )
+    print("📅 Reminder scheduler initialized (checks for due reminders every minute)")
+else:
+    print("📅 Embedded reminder scheduler disabled; expecting `python scheduler.py`")
+
+if EMBEDDED_SCHEDULER and RETENTION_POLICY is not None:
+    scheduler.add_job(
+        func=retention_job,
+        trigger=IntervalTrigger(seconds=RETENTION_INTERVAL),
+        id='retention_job',
+        name='Archive old rows and compact the database',
+        replace_existing=True
+    )
+
+if EMBEDDED_SCHEDULER and BACKUP_DIR:
+    scheduler.add_job(
+        func=backup_job,
+        trigger=IntervalTrigger(seconds=BACKUP_INTERVAL),
+        id='backup_job',
+        name='Back up the database',
+        replace_existing=True
+    )
+
+# Only queries the database while this process has reminder streams open and
+# doesn't hold the reminders lease (so another process creates the reminders)
 scheduler.add_job(
-    func=create_daily_reminder_job,
-    trigger=IntervalTrigger(minutes=2),  # Change to hours=24 for daily
-    id='daily_reminder_job',
-    name='Create daily goal reminders',
+    func=watch_reminders_job,
+    trigger=IntervalTrigger(seconds=5),
+    id='reminder_watcher_job',
+    name='Push reminders from other processes',
     replace_existing=True
 )
 
-print("📅 Daily reminder scheduler initialized (every 2 minutes for testing)")
-print("💡 Change to hours=24 for production use")
+# =============================================================================
+# INSTRUMENTATION
+# =============================================================================
+
+@app.before_request
+def start_request_timer():
+    """Note when the request started, for the latency histogram."""
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    """Record the request's latency under its route pattern (not the raw path)."""
+    started = getattr(g, 'request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        REQUEST_LATENCY.observe(time.perf_counter() - started, request.method, route, str(response.status_code))
+    return response
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Route latency, per-method query time, connection counts and job durations, for Prometheus."""
+    return Response(metrics.render(), content_type=metrics.PROMETHEUS_CONTENT_TYPE)
 
 @app.route('/')
 def home():
@@ -318,64 +773,47 @@ def chat():
             return jsonify({'response': "I'm here to listen! What's on your mind? 🤔"})
         
         # Check if this is the first message in the session
-        if 'first_message' not in session:
-            session['first_message'] = False
-            # For first message, provide initial greeting but still process the message
-            initial_greeting = web_aura.get_initial_greeting()
-            user_response = web_aura.process_message(user_message)
-            
-            # Combine greeting and response
-            full_response = f"{initial_greeting}\n\n---\n\nYou said: \"{user_message}\"\n\n{user_response}"
-            return jsonify({'response': full_response})
+        first_message = 'first_message' not in session
+        session['first_message'] = False
         
-        # Process the message normally
-        response = web_aura.process_message(user_message)
+        response = current_aura().respond(user_message, first_message)
         return jsonify({'response': response})
         
     except Exception as e:
         return jsonify({'response': f"Sorry, something went wrong: {str(e)}"})
 
+@app.route('/chat/batch', methods=['POST'])
+def chat_batch():
+    """
+    Process a list of messages (e.g. queued while offline) in one request and
+    one transaction. See WebAURA.get_batch_results for the body.
+    """
+    try:
+        return jsonify(current_aura().get_batch_results(request.get_json(silent=True)))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except sqlite3.Error as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/reset')
 def reset_session():
-    """Reset the chat session."""
+    """Reset the chat session (keeping the user's identity in multi-user mode)."""
+    user_id = session.get('user_id')
     session.clear()
+    if user_id:
+        session['user_id'] = user_id
     return jsonify({'status': 'Session reset'})
 
 @app.route('/check-reminders')
 def check_reminders():
-    """Check for new unread reminders and return them."""
+    """Check for new unread reminders and return them (polling fallback for /reminders/stream)."""
     try:
-        reminders = web_aura.get_unread_reminders()
+        reminder_messages = current_aura().collect_reminders()
         
-        if reminders:
-            # Format reminders for display
-            reminder_messages = []
-            for reminder_id, message, created_at, goal_text in reminders:
-                try:
-                    date_obj = datetime.datetime.fromisoformat(created_at)
-                    formatted_time = date_obj.strftime("%I:%M %p")
-                except:
-                    formatted_time = "Recently"
-                
-                reminder_messages.append({
-                    'id': reminder_id,
-                    'message': message,
-                    'time': formatted_time,
-                    'goal': goal_text
-                })
-                
-                # Mark as read since we're showing it
-                web_aura.mark_reminder_read(reminder_id)
-            
-            return jsonify({
-                'has_reminders': True,
-                'reminders': reminder_messages
-            })
-        else:
-            return jsonify({
-                'has_reminders': False,
-                'reminders': []
-            })
+        return jsonify({
+            'has_reminders': bool(reminder_messages),
+            'reminders': reminder_messages
+        })
             
     except Exception as e:
         return jsonify({
@@ -383,6 +821,42 @@ def check_reminders():
             'error': str(e)
         })
 
+@app.route('/reminders/stream')
+def reminder_stream():
+    """
+    Server-Sent Events stream of reminders. Sends any unread backlog on
+    connect, then pushes new reminders as the scheduler creates them.
+    An idle stream never touches the database.
+    """
+    aura = current_aura()
+    
+    def events():
+        inbox = queue.Queue()
+        web_aura.reminder_broker.subscribe(aura.user_id, inbox.put)
+        try:
+            yield "retry: 5000\n\n"
+            
+            # Subscribed before claiming the backlog so nothing slips through in between;
+            # claims are exclusive, so a reminder is either in the backlog or pushed
+            for reminder in aura.collect_reminders():
+                yield sse_event(reminder)
+            
+            while True:
+                try:
+                    reminder = inbox.get(timeout=KEEPALIVE_INTERVAL)
+                except queue.Empty:
+                    yield sse_keepalive()
+                    continue
+                yield sse_event(reminder)
+        finally:
+            web_aura.reminder_broker.unsubscribe(aura.user_id, inbox.put)
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 # =============================================================================
 # DASHBOARD ROUTES AND DATA ANALYTICS
 # =============================================================================
@@ -397,19 +871,40 @@ def get_dashboard_data():
     """
     API endpoint to fetch analytics data for the dashboard.
     Returns mood trends and goal progress data as JSON.
+    Optional ?days=N sets the trend window (default 30).
+    ?stats=1 adds long-range statistics, over ?start=/&end= (YYYY-MM-DD,
+    default all history) with a ?window=N day rolling average (default 7).
+    Supports If-None-Match, answering 304 when nothing has changed.
     """
     try:
-        # Get mood trends data using WebAURA instance
-        mood_data = web_aura.get_mood_analytics()
+        days = min(max(request.args.get('days', 30, type=int), 1), 3650)
         
-        # Get goal progress data using WebAURA instance
-        progress_data = web_aura.get_goal_progress_analytics()
+        stats = None
+        if request.args.get('stats') == '1':
+            try:
+                stats = (
+                    analytics.parse_day(request.args.get('start')),
+                    analytics.parse_day(request.args.get('end')),
+                    int(request.args.get('window', analytics.DEFAULT_WINDOW))
+                )
+            except ValueError:
+                return jsonify({'success': False, 'error': 'Invalid start/end date or window'}), 400
         
-        return jsonify({
-            'success': True,
-            'mood_data': mood_data,
-            'progress_data': progress_data
-        })
+        # Cached payload and ETag for this user
+        try:
+            payload, etag = current_aura().get_dashboard_data(days, stats)
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+        else:
+            response = jsonify(payload)
+        
+        # Let the browser keep the body but revalidate it on every fetch
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
         
     except Exception as e:
         return jsonify({
@@ -417,6 +912,78 @@ def get_dashboard_data():
             'error': str(e)
         })
 
+# =============================================================================
+# PAGINATED DATA API
+# =============================================================================
+
+@app.route('/api/<table>')
+def api_page(table):
+    """
+    One page of the user's goals, moods, progress or reminders, newest first.
+    See WebAURA.get_api_page for the query parameters.
+    """
+    if table not in PAGE_TABLES:
+        return jsonify({'success': False, 'error': 'Unknown table'}), 404
+    
+    try:
+        return jsonify(current_aura().get_api_page(table, request.args))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except sqlite3.Error as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+# =============================================================================
+# SEARCH
+# =============================================================================
+
+@app.route('/search')
+def search():
+    """
+    Full-text search over the user's goals and mood descriptions, best match
+    first. See WebAURA.get_search_results for the query parameters.
+    """
+    try:
+        return jsonify(current_aura().get_search_results(request.args))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except sqlite3.Error as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+# =============================================================================
+# DATA EXPORT
+# =============================================================================
+
+@app.route('/export/<table>')
+def export_table(table):
+    """
+    Stream a full table as JSONL or CSV.
+    Query parameters: format=jsonl|csv, gzip=1, start/end=YYYY-MM-DD,
+    archived=1 (include rows moved to the archive by retention.py).
+    """
+    fmt = request.args.get('format', 'jsonl')
+    compress = request.args.get('gzip') == '1'
+    archived = request.args.get('archived') == '1'
+    
+    if table not in EXPORT_TABLES or fmt not in CONTENT_TYPES:
+        return jsonify({'success': False, 'error': 'Unknown table or format'}), 400
+    
+    try:
+        start = parse_bound(request.args.get('start'))
+        end = parse_bound(request.args.get('end'))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid start/end date'}), 400
+    
+    web_aura.flush_writes()
+    stream = export_stream(web_aura.db_name, table, fmt, compress, start, end,
+                           user_id=current_user_id(), archived=archived)
+    
+    filename = f"aura_{table}.{fmt}" + (".gz" if compress else "")
+    return Response(
+        stream_with_context(stream),
+        mimetype='application/gzip' if compress else CONTENT_TYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
 if __name__ == '__main__':
     print("🌐 Starting AURA Web Interface...")
     print("🚀 AURA will be available at: http://localhost:5000")
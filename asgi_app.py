@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+AURA ASGI Server
+An asyncio entry point serving the same routes as app.py (except /export).
+Request handling stays on the event loop; every database call runs on a
+bounded thread pool, so slow SQLite work never blocks other connections.
+
+Usage:
+    uvicorn asgi_app:app --port 8000
+    AURA_DB_WORKERS=16 uvicorn asgi_app:app --port 8000
+
+Author: Mark Mikile Mutunga
+Copyright (c) 2025 Mark Mikile Mutunga. All rights reserved.
+
+This software is licensed under the MIT License.
+See the LICENSE file for full license text.
+"""
+
+import asyncio
+import base64
+import functools
+import hashlib
+import hmac
+import json
+import os
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+# Reuse the Flask app's WebAURA instance, scheduler and settings
+from app import app as flask_app, web_aura, shutdown, MULTI_USER
+from aura import DEFAULT_USER, PAGE_TABLES
+from broker import KEEPALIVE_INTERVAL, sse_event, sse_keepalive
+import analytics
+import metrics
+from metrics import REQUEST_LATENCY
+
+# Database work is capped at the connection pool size by default
+DB_WORKERS = int(os.environ.get('AURA_DB_WORKERS', '8'))
+
+SESSION_COOKIE = 'aura_session'
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+
+def load_template(name):
+    """Read a static template once at startup."""
+    with open(os.path.join(TEMPLATE_DIR, name), 'rb') as handle:
+        return handle.read()
+
+
+PAGES = {'/': load_template('index.html'), '/dashboard': load_template('dashboard.html')}
+
+
+class DatabaseExecutor:
+    """
+    Runs blocking WebAURA calls on a fixed-size thread pool. The semaphore
+    keeps excess requests waiting on the event loop instead of piling up
+    in the executor queue.
+    """
+
+    def __init__(self, workers=DB_WORKERS):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='aura-db')
+        self.slots = None
+        self.workers = workers
+
+    async def run(self, func, *args):
+        """Run func(*args) on the pool and await its result."""
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.workers)
+        async with self.slots:
+            return await asyncio.get_running_loop().run_in_executor(self.pool, func, *args)
+
+    def close(self):
+        """Wait for running calls to finish and stop the pool."""
+        self.pool.shutdown(wait=True)
+
+
+db = DatabaseExecutor()
+
+# =============================================================================
+# SESSIONS
+# =============================================================================
+
+def sign(payload):
+    """HMAC-sign a session payload with the Flask app's secret key."""
+    key = flask_app.secret_key.encode('utf-8')
+    return hmac.new(key, payload, hashlib.sha256).hexdigest()
+
+
+def load_session(headers):
+    """Decode the signed session cookie, returning {} if missing or tampered with."""
+    for part in headers.get(b'cookie', b'').decode('latin-1').split(';'):
+        name, _, value = part.strip().partition('=')
+        if name != SESSION_COOKIE or '.' not in value:
+            continue
+        data, signature = value.rsplit('.', 1)
+        if hmac.compare_digest(sign(data.encode('ascii')), signature):
+            try:
+                return json.loads(base64.urlsafe_b64decode(data))
+            except ValueError:
+                return {}
+    return {}
+
+
+def session_cookie(session):
+    """Encode a session dict as a Set-Cookie header value."""
+    data = base64.urlsafe_b64encode(json.dumps(session).encode('utf-8'))
+    value = f"{data.decode('ascii')}.{sign(data)}"
+    return f"{SESSION_COOKIE}={value}; Path=/; HttpOnly; SameSite=Lax; Max-Age=2678400"
+
+
+def session_user_id(session):
+    """Map a session to a user ID, as current_user_id() does in app.py."""
+    if not MULTI_USER:
+        return DEFAULT_USER
+    if 'user_id' not in session:
+        session['user_id'] = uuid.uuid4().hex
+    return session['user_id']
+
+# =============================================================================
+# REQUEST HANDLERS
+# =============================================================================
+
+async def chat(request):
+    """Handle chat messages from the web interface."""
+    try:
+        data = json.loads(request['body'] or b'{}')
+        user_message = data.get('message', '').strip()
+
+        if not user_message:
+            return 200, {'response': "I'm here to listen! What's on your mind? 🤔"}
+
+        session = request['session']
+        first_message = 'first_message' not in session
+        session['first_message'] = False
+
+        aura = web_aura.for_user(session_user_id(session))
+        return 200, {'response': await db.run(aura.respond, user_message, first_message)}
+
+    except Exception as e:
+        return 200, {'response': f"Sorry, something went wrong: {str(e)}"}
+
+
+async def chat_batch(request):
+    """Process a list of messages in one request and one transaction, as /chat/batch in app.py."""
+    aura = web_aura.for_user(session_user_id(request['session']))
+    try:
+        data = json.loads(request['body'] or b'{}')
+        return 200, await db.run(aura.get_batch_results, data)
+    except ValueError as e:
+        return 400, {'success': False, 'error': str(e)}
+    except sqlite3.Error as e:
+        return 500, {'success': False, 'error': str(e)}
+
+
+async def reset_session(request):
+    """Reset the chat session (keeping the user's identity in multi-user mode)."""
+    user_id = request['session'].get('user_id')
+    request['session'].clear()
+    if user_id:
+        request['session']['user_id'] = user_id
+    return 200, {'status': 'Session reset'}
+
+
+async def check_reminders(request):
+    """Check for new unread reminders and return them."""
+    try:
+        aura = web_aura.for_user(session_user_id(request['session']))
+        reminder_messages = await db.run(aura.collect_reminders)
+        return 200, {'has_reminders': bool(reminder_messages), 'reminders': reminder_messages}
+    except Exception as e:
+        return 200, {'has_reminders': False, 'error': str(e)}
+
+
+async def dashboard_data(request):
+    """
+    Analytics JSON for the dashboard, answering 304 when the ETag matches.
+    Takes the same days/stats/start/end/window parameters as Flask's /data.
+    """
+    try:
+        query = {name: values[0] for name, values in request['query'].items()}
+        try:
+            days = int(query.get('days', '30'))
+        except ValueError:
+            days = 30
+        days = min(max(days, 1), 3650)
+
+        stats = None
+        if query.get('stats') == '1':
+            try:
+                stats = (analytics.parse_day(query.get('start')), analytics.parse_day(query.get('end')),
+                         int(query.get('window', analytics.DEFAULT_WINDOW)))
+            except ValueError:
+                return 400, {'success': False, 'error': 'Invalid start/end date or window'}
+
+        aura = web_aura.for_user(session_user_id(request['session']))
+        try:
+            payload, etag = await db.run(aura.get_dashboard_data, days, stats)
+        except ValueError as e:
+            return 400, {'success': False, 'error': str(e)}
+
+        headers = [(b'etag', f'"{etag}"'.encode('ascii')), (b'cache-control', b'no-cache')]
+        if_none_match = request['headers'].get(b'if-none-match', b'').decode('latin-1')
+        if etag in [tag.strip().strip('"') for tag in if_none_match.split(',')]:
+            return 304, None, headers
+        return 200, payload, headers
+
+    except Exception as e:
+        return 200, {'success': False, 'error': str(e)}
+
+
+async def api_page(request, table):
+    """One page of the user's goals, moods, progress or reminders, newest first."""
+    if table not in PAGE_TABLES:
+        return 404, {'success': False, 'error': 'Unknown table'}
+
+    args = {name: values[0] for name, values in request['query'].items()}
+    aura = web_aura.for_user(session_user_id(request['session']))
+    try:
+        return 200, await db.run(aura.get_api_page, table, args)
+    except ValueError as e:
+        return 400, {'success': False, 'error': str(e)}
+    except sqlite3.Error as e:
+        return 500, {'success': False, 'error': str(e)}
+
+
+async def search(request):
+    """Full-text search over the user's goals and mood descriptions."""
+    args = {name: values[0] for name, values in request['query'].items()}
+    aura = web_aura.for_user(session_user_id(request['session']))
+    try:
+        return 200, await db.run(aura.get_search_results, args)
+    except ValueError as e:
+        return 400, {'success': False, 'error': str(e)}
+    except sqlite3.Error as e:
+        return 500, {'success': False, 'error': str(e)}
+
+
+async def reminder_stream(scope, receive, send):
+    """
+    Server-Sent Events stream of reminders, as /reminders/stream in app.py.
+    Each open stream costs one queue on the event loop, no thread.
+    """
+    session = load_session(dict(scope['headers']))
+    before = dict(session)
+    aura = web_aura.for_user(session_user_id(session))
+
+    loop = asyncio.get_running_loop()
+    inbox = asyncio.Queue()
+
+    def deliver(reminder):
+        # Called on the scheduler thread
+        loop.call_soon_threadsafe(inbox.put_nowait, reminder)
+
+    web_aura.reminder_broker.subscribe(aura.user_id, deliver)
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        headers = [(b'content-type', b'text/event-stream'), (b'cache-control', b'no-cache'),
+                   (b'x-accel-buffering', b'no')]
+        if session != before:
+            headers.append((b'set-cookie', session_cookie(session).encode('latin-1')))
+        await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+        await send_chunk(send, "retry: 5000\n\n")
+
+        # Subscribed before claiming the backlog so nothing slips through in between;
+        # claims are exclusive, so a reminder is either in the backlog or pushed
+        for reminder in await db.run(aura.collect_reminders):
+            await send_chunk(send, sse_event(reminder))
+
+        while not disconnected.done():
+            getter = asyncio.ensure_future(inbox.get())
+            done, _ = await asyncio.wait({getter, disconnected}, timeout=KEEPALIVE_INTERVAL,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done:
+                getter.cancel()
+                if not disconnected.done():
+                    await send_chunk(send, sse_keepalive())
+            else:
+                await send_chunk(send, sse_event(getter.result()))
+    finally:
+        web_aura.reminder_broker.unsubscribe(aura.user_id, deliver)
+        disconnected.cancel()
+
+
+async def wait_for_disconnect(receive):
+    """Return once the client has closed the connection."""
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def send_chunk(send, text):
+    """Send part of a streaming response body."""
+    await send({'type': 'http.response.body', 'body': text.encode('utf-8'), 'more_body': True})
+
+
+ROUTES = {
+    ('POST', '/chat'): chat,
+    ('POST', '/chat/batch'): chat_batch,
+    ('GET', '/reset'): reset_session,
+    ('GET', '/check-reminders'): check_reminders,
+    ('GET', '/data'): dashboard_data,
+    ('GET', '/search'): search,
+}
+
+# =============================================================================
+# ASGI PLUMBING
+# =============================================================================
+
+async def read_body(receive):
+    """Collect the full request body."""
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+
+async def send_response(send, status, body, content_type, headers=()):
+    """Send a complete HTTP response."""
+    headers = [(b'content-type', content_type), (b'content-length', str(len(body)).encode('ascii'))] + list(headers)
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def lifespan(receive, send):
+    """Handle server startup/shutdown, flushing writes and closing connections on exit."""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            db.close()
+            shutdown()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+def route_label(method, path):
+    """The route pattern a request matched, as Flask's url_rule would name it."""
+    if path in PAGES or path in ('/reminders/stream', '/metrics') or (method, path) in ROUTES:
+        return path
+    if path.startswith('/api/'):
+        return '/api/<table>'
+    return 'unmatched'
+
+
+async def app(scope, receive, send):
+    """ASGI entry point."""
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+
+    started = time.perf_counter()
+    labels = (scope['method'], route_label(scope['method'], scope['path']))
+
+    async def send_and_record(message):
+        # Latency up to the response headers, like Flask's after_request
+        if message['type'] == 'http.response.start':
+            REQUEST_LATENCY.observe(time.perf_counter() - started, *labels, str(message['status']))
+        await send(message)
+
+    await dispatch(scope, receive, send_and_record)
+
+
+async def dispatch(scope, receive, send):
+    """Route an HTTP request to its handler."""
+    path, method = scope['path'], scope['method']
+
+    if method == 'GET' and path in PAGES:
+        return await send_response(send, 200, PAGES[path], b'text/html; charset=utf-8')
+
+    if method == 'GET' and path == '/reminders/stream':
+        return await reminder_stream(scope, receive, send)
+
+    if method == 'GET' and path == '/metrics':
+        body = metrics.render().encode('utf-8')
+        return await send_response(send, 200, body, metrics.PROMETHEUS_CONTENT_TYPE.encode('ascii'))
+
+    handler = ROUTES.get((method, path))
+    if handler is None and method == 'GET' and path.startswith('/api/'):
+        handler = functools.partial(api_page, table=path[len('/api/'):])
+    if handler is None:
+        return await send_response(send, 404, b'{"error": "Not found"}', b'application/json')
+
+    headers = dict(scope['headers'])
+    session = load_session(headers)
+    before = dict(session)
+    request = {
+        'headers': headers,
+        'query': parse_qs(scope.get('query_string', b'').decode('latin-1')),
+        'session': session,
+        'body': await read_body(receive),
+    }
+
+    status, payload, *extra = await handler(request)
+    extra_headers = list(extra[0]) if extra else []
+    if session != before:
+        extra_headers.append((b'set-cookie', session_cookie(session).encode('latin-1')))
+
+    body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+    await send_response(send, status, body, b'application/json', extra_headers)
@@ -27,13 +27,121 @@ import sqlite3
 import datetime
 import re
 import random
+import copy
+import json
+import base64
+import binascii
+
+from database import ConnectionManager, WriteBehindQueue
+from migrations import migrate, rebuild_goal_stats
+from classifier import MessageClassifier
+from dedupe import find_duplicate, index_goal
+from metrics import QUERY_LATENCY
+
+# Insert statements shared by the AURA methods, write-behind batches and bulk import
+INSERT_GOAL_SQL = '''
+    INSERT INTO goals (user_id, goal_text, date_added, added_ts)
+    VALUES (?, ?, ?, ?)
+'''
+
+INSERT_MOOD_SQL = '''
+    INSERT INTO moods (user_id, mood, description, date_logged, logged_ts)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+INSERT_PROGRESS_SQL = '''
+    INSERT INTO progress (user_id, goal_id, status, created_at, created_ts)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+INSERT_REMINDER_SQL = '''
+    INSERT INTO reminders (user_id, goal_id, message, created_at, created_ts)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+# Reminder wordings, picked at random for each reminder
+REMINDER_TEMPLATES = [
+    "🔔 Daily Reminder: Did you work on '{goal}' today?",
+    "⏰ Time check: Have you made progress on '{goal}' today?",
+    "🎯 Gentle reminder: How did '{goal}' go today?",
+    "💭 Just checking in: Any progress on '{goal}' today?",
+    "🌟 Daily check: Did you take a step toward '{goal}' today?"
+]
+
+# Default gap between scheduled reminders for a goal
+DEFAULT_REMINDER_INTERVAL = 24 * 60 * 60
+
+# Owner of all data in single-user mode (and of rows from before multi-user support)
+DEFAULT_USER = 'default'
+
+def timestamps(when=None):
+    """Return (ISO text, epoch seconds) for a local datetime, defaulting to now."""
+    when = when or datetime.datetime.now()
+    return when.isoformat(), int(when.timestamp())
+
+# Tables served a page at a time by get_page(): (epoch column, columns returned)
+PAGE_TABLES = {
+    'goals': ('added_ts', ['id', 'goal_text', 'date_added', 'status']),
+    'moods': ('logged_ts', ['id', 'mood', 'description', 'date_logged']),
+    'progress': ('created_ts', ['id', 'goal_id', 'status', 'created_at']),
+    'reminders': ('created_ts', ['id', 'goal_id', 'message', 'created_at', 'is_read', 'delivered_at']),
+}
+
+def encode_cursor(ts, row_id):
+    """Pack a row's (timestamp, id) position into an opaque page cursor."""
+    return base64.urlsafe_b64encode(json.dumps([ts, row_id]).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    """Unpack a page cursor. Raises ValueError if it is malformed."""
+    try:
+        ts, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return int(ts), int(row_id)
+    except (TypeError, ValueError, UnicodeError, binascii.Error):
+        raise ValueError("Invalid cursor")
+
+# Tables searchable with search(): (text column, epoch column, date column, extra columns returned)
+SEARCH_TABLES = {
+    'goals': ('goal_text', 'added_ts', 'date_added', ['status']),
+    'moods': ('description', 'logged_ts', 'date_logged', ['mood']),
+}
+
+# Most matches per table that search() ranks; beyond this only the newest are considered
+SEARCH_RANK_LIMIT = 5000
+
+def search_terms(query):
+    """Split a free-text query into words (letters, digits and underscores)."""
+    return re.findall(r'\w+', query)
+
+def fts_match(terms):
+    """An FTS5 MATCH expression requiring every term, each as a prefix."""
+    return ' '.join(f'"{term}"*' for term in terms)
+
+def reminder_text(goal_text):
+    """Pick a reminder message for a goal."""
+    return random.choice(REMINDER_TEMPLATES).format(goal=goal_text)
+
+def live_streak(current_streak, last_yes_day, today=None):
+    """A stored streak still counts if its last 'yes' was today or yesterday."""
+    if not last_yes_day:
+        return 0
+    today = today or datetime.date.today()
+    if last_yes_day >= (today - datetime.timedelta(days=1)).isoformat():
+        return current_streak
+    return 0
 
 class AURA:
-    def __init__(self):
+    def __init__(self, db_name="aura_memory.db", pooled=True, write_behind=False, user_id=DEFAULT_USER):
         """Initialize AURA with database connection and setup."""
-        self.db_name = "aura_memory.db"
+        self.db_name = db_name
+        # Every query is scoped to this user; see for_user()
+        self.user_id = user_id
+        # Long-lived connection pool shared by every data method
+        self.db = ConnectionManager(self.db_name, pooled=pooled)
         self.setup_database()
         
+        # Optional write-behind buffer for mood/progress/reminder inserts
+        self.writes = WriteBehindQueue(self.db) if write_behind else None
+        
         # Empathetic mood responses (single, more personal responses)
         self.mood_responses = {
             "tired": "I hear you. 💙 Maybe a quick rest or even a 5-minute stretch could help.",
@@ -50,120 +158,124 @@ class AURA:
             "confused": "Confusion is normal when learning something new 🤔. Take it step by step.",
             "default": "Thanks for sharing that. Remember, I'm here to keep you moving forward 💡."
         }
+        
+        # Goal/mood matcher compiled once from the phrases above
+        self.classifier = MessageClassifier([mood for mood in self.mood_responses if mood != "default"])
     
     def setup_database(self):
-        """Create database tables if they don't exist."""
+        """Create or upgrade the database schema."""
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            
-            # Create goals table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS goals (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    goal_text TEXT NOT NULL,
-                    date_added TEXT NOT NULL,
-                    status TEXT DEFAULT 'active'
-                )
-            ''')
-            
-            # Create moods table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS moods (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    mood TEXT NOT NULL,
-                    description TEXT,
-                    date_logged TEXT NOT NULL
-                )
-            ''')
-            
-            # Create progress table for goal tracking
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS progress (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    goal_id INTEGER NOT NULL,
-                    status TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    FOREIGN KEY (goal_id) REFERENCES goals (id)
-                )
-            ''')
-            
-            # Create reminders table for scheduled notifications
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS reminders (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    goal_id INTEGER NOT NULL,
-                    message TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    is_read INTEGER DEFAULT 0,
-                    FOREIGN KEY (goal_id) REFERENCES goals (id)
-                )
-            ''')
-            
-            conn.commit()
-            conn.close()
+            with self.db.connection() as conn:
+                migrate(conn)
             print("🤖 AURA database initialized successfully!")
             
         except sqlite3.Error as e:
             print(f"❌ Database error: {e}")
     
-    def add_goal(self, goal_text):
-        """Store a new goal in the database."""
+    def for_user(self, user_id):
+        """
+        Return a view of this AURA scoped to another user.
+        The view shares the connection pool, write queue and caches.
+        """
+        if user_id == self.user_id:
+            return self
+        
+        scoped = copy.copy(self)
+        scoped.user_id = user_id
+        return scoped
+    
+    def close(self):
+        """Flush queued writes and close all pooled database connections."""
+        if self.writes is not None:
+            self.writes.close()
+        self.db.close()
+    
+    def _insert(self, sql, params):
+        """
+        Run an INSERT now, or queue it when write-behind mode is on. Inside
+        a transaction() it always runs now, so it commits with the rest.
+        """
+        if self.writes is not None and not self.db.in_transaction():
+            self.writes.put(sql, params)
+            return
+        
+        with self.db.transaction() as conn:
+            conn.execute(sql, params)
+    
+    def flush_writes(self):
+        """Write out any queued inserts so reads see them."""
+        if self.writes is not None:
+            self.writes.flush()
+    
+    def _data_changed(self, *tables):
+        """Hook called after a write to the given tables (used by WebAURA's cache)."""
+        pass
+    
+    def _reminder_created(self, reminder_id, message, created_at, goal_text):
+        """Hook called after a reminder is saved (used by WebAURA to push it to open tabs)."""
+        pass
+    
+    def clean_goal_text(self, goal_text):
+        """Clean up the goal text (remove "I want to" prefix)."""
+        clean_goal = re.sub(r'^(i want to|i\'d like to|i would like to)\s*', '', goal_text.lower()).strip()
+        return clean_goal.capitalize()
+    
+    @QUERY_LATENCY.timed
+    def add_goal(self, goal_text, when=None):
+        """
+        Store a new goal in the database, unless the user already has an
+        active goal saying the same thing (see dedupe.py). when (a local
+        datetime) backdates it; it defaults to now.
+        """
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
+            clean_goal = self.clean_goal_text(goal_text)
             
-            # Clean up the goal text (remove "I want to" prefix)
-            clean_goal = re.sub(r'^(i want to|i\'d like to|i would like to)\s*', '', goal_text.lower()).strip()
-            clean_goal = clean_goal.capitalize()
+            # Check and insert under the write lock, so a repeated goal sent
+            # twice at once can't slip in twice
+            with self.db.transaction(immediate=True) as conn:
+                duplicate = find_duplicate(conn, self.user_id, clean_goal)
+                if duplicate is None:
+                    cursor = conn.cursor()
+                    cursor.execute(INSERT_GOAL_SQL, (self.user_id, clean_goal, *timestamps(when)))
+                    index_goal(conn, cursor.lastrowid, self.user_id, clean_goal)
             
-            cursor.execute('''
-                INSERT INTO goals (goal_text, date_added)
-                VALUES (?, ?)
-            ''', (clean_goal, datetime.datetime.now().isoformat()))
-            
-            conn.commit()
-            conn.close()
+            if duplicate is not None:
+                return f"🔁 You already have this goal: '{duplicate[1]}'. I'll keep tracking that one!"
             
+            self._data_changed('goals')
             return f"✅ Great! I've added your goal: '{clean_goal}' to your list. I'll help you remember it!"
             
         except sqlite3.Error as e:
             return f"❌ Error saving goal: {e}"
     
-    def add_mood(self, mood, description=""):
-        """Store a mood entry in the database."""
+    @QUERY_LATENCY.timed
+    def add_mood(self, mood, description="", when=None):
+        """Store a mood entry in the database, logged at when (a local datetime, default now)."""
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO moods (mood, description, date_logged)
-                VALUES (?, ?, ?)
-            ''', (mood, description, datetime.datetime.now().isoformat()))
-            
-            conn.commit()
-            conn.close()
+            self._insert(INSERT_MOOD_SQL, (self.user_id, mood, description, *timestamps(when)))
             
+            self._data_changed('moods')
             return True
             
         except sqlite3.Error as e:
             print(f"❌ Error saving mood: {e}")
             return False
     
-    def get_goals(self):
-        """Retrieve all active goals from the database."""
+    @QUERY_LATENCY.timed
+    def get_goals(self, limit=None):
+        """Retrieve active goals from the database, newest first (at most limit)."""
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT goal_text, date_added FROM goals 
-                WHERE status = 'active' 
-                ORDER BY date_added DESC
-            ''')
+                cursor.execute('''
+                    SELECT goal_text, date_added FROM goals 
+                    WHERE user_id = ? AND status = 'active' 
+                    ORDER BY added_ts DESC
+                    LIMIT ?
+                ''', (self.user_id, -1 if limit is None else limit))
             
-            goals = cursor.fetchall()
-            conn.close()
+                goals = cursor.fetchall()
             
             return goals
             
@@ -171,20 +283,21 @@ class AURA:
             print(f"❌ Error retrieving goals: {e}")
             return []
     
-    def get_goals_with_ids(self):
-        """Retrieve all active goals with their IDs from the database."""
+    @QUERY_LATENCY.timed
+    def get_goals_with_ids(self, limit=None):
+        """Retrieve active goals with their IDs from the database, newest first (at most limit)."""
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT id, goal_text, date_added FROM goals 
-                WHERE status = 'active' 
-                ORDER BY date_added DESC
-            ''')
+                cursor.execute('''
+                    SELECT id, goal_text, date_added FROM goals 
+                    WHERE user_id = ? AND status = 'active' 
+                    ORDER BY added_ts DESC
+                    LIMIT ?
+                ''', (self.user_id, -1 if limit is None else limit))
             
-            goals = cursor.fetchall()
-            conn.close()
+                goals = cursor.fetchall()
             
             return goals
             
@@ -192,24 +305,205 @@ class AURA:
             print(f"❌ Error retrieving goals: {e}")
             return []
     
+    @QUERY_LATENCY.timed
+    def get_page(self, table, limit=50, cursor=None, start=None, end=None, **filters):
+        """
+        Return one page of the user's rows from a table, newest first, as
+        (list of dicts, next cursor or None).
+        
+        Pages are keyset-paginated on (timestamp, id), so each page is an
+        index range scan no matter how deep the client pages. start/end are
+        epoch seconds (end exclusive); filters are column=value matches
+        (e.g. status='active', is_read=0).
+        """
+        ts_column, columns = PAGE_TABLES[table]
+        where, params = ['user_id = ?'], [self.user_id]
+        
+        for column, value in filters.items():
+            if column not in columns:
+                raise ValueError(f"Unknown filter {column!r}")
+            where.append(f'{column} = ?')
+            params.append(value)
+        if start is not None:
+            where.append(f'{ts_column} >= ?')
+            params.append(start)
+        if end is not None:
+            where.append(f'{ts_column} < ?')
+            params.append(end)
+        if cursor is not None:
+            where.append(f'({ts_column}, id) < (?, ?)')
+            params.extend(decode_cursor(cursor))
+        
+        if table != 'goals':
+            self.flush_writes()
+        
+        with self.db.connection() as conn:
+            rows = conn.execute(f'''
+                SELECT {ts_column}, {", ".join(columns)} FROM {table}
+                WHERE {" AND ".join(where)}
+                ORDER BY {ts_column} DESC, id DESC
+                LIMIT ?
+            ''', params + [limit + 1]).fetchall()
+        
+        # The extra row only tells us whether there is another page
+        next_cursor = encode_cursor(*rows[limit - 1][:2]) if len(rows) > limit else None
+        return [dict(zip(columns, row[1:])) for row in rows[:limit]], next_cursor
+    
+    @QUERY_LATENCY.timed
+    def search(self, query, tables=tuple(SEARCH_TABLES), limit=20, start=None, end=None):
+        """
+        Search the user's goal texts and mood descriptions for every word in
+        query (prefix matches, so "run" finds "running"). Returns up to limit
+        dicts, best match first: table, id, text, snippet (matches wrapped in
+        [ ]), date, rank, plus status (goals) or mood (moods). start/end are
+        epoch seconds (end exclusive).
+        
+        Uses the goals_fts/moods_fts indexes, ranked by BM25; on SQLite builds
+        without FTS5 it falls back to LIKE scans, newest first.
+        """
+        terms = search_terms(query)
+        if not terms:
+            return []
+        if 'moods' in tables:
+            self.flush_writes()
+        
+        results = []
+        with self.db.connection() as conn:
+            for table in tables:
+                results.extend(self._search_table(conn, table, terms, limit, start, end))
+        
+        # BM25 ranks are lower-is-better; LIKE results have no rank and keep their order
+        if all(result['rank'] is not None for result in results):
+            results.sort(key=lambda result: result['rank'])
+        return results[:limit]
+    
+    def _search_table(self, conn, table, terms, limit, start, end):
+        """Matches from one table, as result dicts."""
+        text_column, ts_column, date_column, extra = SEARCH_TABLES[table]
+        where, params = ['t.user_id = ?'], [self.user_id]
+        if start is not None:
+            where.append(f't.{ts_column} >= ?')
+            params.append(start)
+        if end is not None:
+            where.append(f't.{ts_column} < ?')
+            params.append(end)
+        columns = ', '.join(f't.{column}' for column in ['id', text_column, date_column] + extra)
+        
+        fts_table = f'{table}_fts'
+        has_index = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,)
+        ).fetchone()
+        
+        if has_index:
+            match = [fts_match(terms)] + params
+            
+            # Scoring every match of a very common word is slow, so only the
+            # newest SEARCH_RANK_LIMIT matches are ranked. CROSS JOIN keeps the
+            # index as the outer loop; driven by a date index, SQLite would
+            # re-run the MATCH for every row in the range.
+            cutoff = conn.execute(f'''
+                SELECT {fts_table}.rowid
+                FROM {fts_table}
+                CROSS JOIN {table} t ON t.id = {fts_table}.rowid
+                WHERE {fts_table} MATCH ? AND {" AND ".join(where)}
+                ORDER BY {fts_table}.rowid DESC
+                LIMIT 1 OFFSET ?
+            ''', match + [SEARCH_RANK_LIMIT - 1]).fetchone()
+            if cutoff is not None:
+                where.append(f'{fts_table}.rowid >= ?')
+                params.append(cutoff[0])
+            
+            rows = conn.execute(f'''
+                SELECT {columns},
+                       snippet({fts_table}, 0, '[', ']', '…', 12),
+                       bm25({fts_table}) AS rank
+                FROM {fts_table}
+                CROSS JOIN {table} t ON t.id = {fts_table}.rowid
+                WHERE {fts_table} MATCH ? AND {" AND ".join(where)}
+                ORDER BY rank
+                LIMIT ?
+            ''', [fts_match(terms)] + params + [limit]).fetchall()
+        else:
+            for term in terms:
+                where.append(f"t.{text_column} LIKE ? ESCAPE '\\'")
+                params.append('%' + re.sub(r'([%_\\])', r'\\\1', term) + '%')
+            rows = conn.execute(f'''
+                SELECT {columns}, t.{text_column}, NULL
+                FROM {table} t
+                WHERE {" AND ".join(where)}
+                ORDER BY t.{ts_column} DESC
+                LIMIT ?
+            ''', params + [limit]).fetchall()
+        
+        return [
+            {
+                'table': table, 'id': row[0], 'text': row[1], 'date': row[2],
+                **dict(zip(extra, row[3:-2])),
+                'snippet': row[-2],
+                'rank': row[-1],
+            }
+            for row in rows
+        ]
+    
+    @QUERY_LATENCY.timed
     def save_progress(self, goal_id, status):
         """Save progress for a specific goal."""
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
+            self._insert(INSERT_PROGRESS_SQL, (self.user_id, goal_id, status, *timestamps()))
             
-            cursor.execute('''
-                INSERT INTO progress (goal_id, status, created_at)
-                VALUES (?, ?, ?)
-            ''', (goal_id, status, datetime.datetime.now().isoformat()))
+            self._data_changed('progress')
+            return True
             
-            conn.commit()
-            conn.close()
+        except sqlite3.Error as e:
+            print(f"❌ Error saving progress: {e}")
+            return False
+    
+    @QUERY_LATENCY.timed
+    def get_goal_stats(self, goal_id):
+        """
+        Check-in counts and streaks for one goal, read from the goal_stats
+        row the progress trigger keeps current. Returns None for a goal
+        without check-ins.
+        """
+        try:
+            self.flush_writes()
+            with self.db.connection() as conn:
+                row = conn.execute('''
+                    SELECT yes_count, no_count, maybe_count, total,
+                           current_streak, longest_streak, last_yes_day, last_check_in
+                    FROM goal_stats
+                    WHERE goal_id = ? AND user_id = ?
+                ''', (goal_id, self.user_id)).fetchone()
             
+        except sqlite3.Error as e:
+            print(f"❌ Error fetching goal stats: {e}")
+            return None
+        
+        if row is None:
+            return None
+        yes_count, no_count, maybe_count, total, current, longest, last_yes_day, last_check_in = row
+        return {
+            'yes_count': yes_count,
+            'no_count': no_count,
+            'maybe_count': maybe_count,
+            'total': total,
+            'completion_rate': round(yes_count / total, 3) if total else None,
+            'current_streak': live_streak(current, last_yes_day),
+            'longest_streak': longest,
+            'last_check_in': last_check_in,
+        }
+    
+    def rebuild_goal_stats(self):
+        """Recompute this user's goal_stats from scratch, e.g. after backfilling old progress."""
+        try:
+            self.flush_writes()
+            with self.db.transaction() as conn:
+                rebuild_goal_stats(conn, self.user_id)
+            self._data_changed('progress')
             return True
             
         except sqlite3.Error as e:
-            print(f"❌ Error saving progress: {e}")
+            print(f"❌ Error rebuilding goal stats: {e}")
             return False
     
     def ask_goal_progress(self):
@@ -261,42 +555,40 @@ class AURA:
         print("\n✨ Thanks for sharing your progress! Every step forward matters! 🚀")
         print("=" * 50)
     
+    @QUERY_LATENCY.timed
     def save_reminder(self, goal_id, message):
-        """Save a reminder message to the database."""
+        """Save a reminder message to the database. Returns its ID, or False on error."""
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO reminders (goal_id, message, created_at)
-                VALUES (?, ?, ?)
-            ''', (goal_id, message, datetime.datetime.now().isoformat()))
+            # Written straight through (never write-behind) so the caller gets the new ID
+            with self.db.transaction() as conn:
+                reminder_id = conn.execute(
+                    INSERT_REMINDER_SQL, (self.user_id, goal_id, message, *timestamps())
+                ).lastrowid
             
-            conn.commit()
-            conn.close()
-            
-            return True
+            self._data_changed('reminders')
+            return reminder_id
             
         except sqlite3.Error as e:
             print(f"❌ Error saving reminder: {e}")
             return False
     
+    @QUERY_LATENCY.timed
     def get_unread_reminders(self):
         """Retrieve all unread reminder messages from the database."""
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
+            self.flush_writes()
+            with self.db.connection() as conn:
+                cursor = conn.cursor()
             
-            cursor.execute('''
-                SELECT r.id, r.message, r.created_at, g.goal_text 
-                FROM reminders r
-                JOIN goals g ON r.goal_id = g.id
-                WHERE r.is_read = 0
-                ORDER BY r.created_at DESC
-            ''')
+                cursor.execute('''
+                    SELECT r.id, r.message, r.created_at, g.goal_text 
+                    FROM reminders r
+                    JOIN goals g ON r.goal_id = g.id
+                    WHERE r.user_id = ? AND r.is_read = 0
+                    ORDER BY r.created_ts DESC
+                ''', (self.user_id,))
             
-            reminders = cursor.fetchall()
-            conn.close()
+                reminders = cursor.fetchall()
             
             return reminders
             
@@ -304,27 +596,95 @@ class AURA:
             print(f"❌ Error retrieving reminders: {e}")
             return []
     
+    @QUERY_LATENCY.timed
+    def claim_reminders(self, limit=50, reminder_id=None):
+        """
+        Atomically fetch and mark delivered the user's unread reminders,
+        newest first (or just reminder_id, if it is still unread).
+        Returns (id, message, created_at, goal_text) rows. Two callers
+        racing for the same reminders never both get one.
+        """
+        try:
+            self.flush_writes()
+            delivered_at, delivered_ts = timestamps()
+            
+            # Only reminders whose goal still exists, like get_unread_reminders()
+            pending = '''
+                SELECT r.id FROM reminders r
+                WHERE r.user_id = ? AND r.is_read = 0
+                AND EXISTS (SELECT 1 FROM goals g WHERE g.id = r.goal_id)
+            '''
+            params = [delivered_at, delivered_ts, self.user_id]
+            if reminder_id is not None:
+                pending += ' AND r.id = ?'
+                params.append(reminder_id)
+            pending += ' ORDER BY r.created_ts DESC LIMIT ?'
+            params.append(-1 if limit is None else limit)
+            
+            # Most calls find nothing; check with a read first so they never
+            # queue behind writers for the write lock
+            with self.db.connection() as conn:
+                if conn.execute(
+                    'SELECT 1 FROM reminders WHERE user_id = ? AND is_read = 0 LIMIT 1', (self.user_id,)
+                ).fetchone() is None:
+                    return []
+            
+            with self.db.transaction(immediate=True) as conn:
+                rows = conn.execute(f'''
+                    UPDATE reminders
+                    SET is_read = 1, delivered_at = ?, delivered_ts = ?
+                    WHERE id IN ({pending})
+                    RETURNING id, message, created_at, created_ts,
+                        (SELECT goal_text FROM goals WHERE goals.id = reminders.goal_id)
+                ''', params).fetchall()
+            
+            if rows:
+                self._data_changed('reminders')
+            
+            # RETURNING order is unspecified
+            rows.sort(key=lambda row: row[3], reverse=True)
+            return [(rid, message, created_at, goal_text) for rid, message, created_at, _, goal_text in rows]
+            
+        except sqlite3.Error as e:
+            print(f"❌ Error claiming reminders: {e}")
+            return []
+    
+    @QUERY_LATENCY.timed
     def mark_reminder_read(self, reminder_id):
         """Mark a reminder as read."""
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
+            with self.db.transaction() as conn:
+                cursor = conn.cursor()
             
-            cursor.execute('''
-                UPDATE reminders 
-                SET is_read = 1 
-                WHERE id = ?
-            ''', (reminder_id,))
-            
-            conn.commit()
-            conn.close()
+                cursor.execute('''
+                    UPDATE reminders 
+                    SET is_read = 1, delivered_at = ?, delivered_ts = ?
+                    WHERE id = ? AND user_id = ? AND is_read = 0
+                ''', (*timestamps(), reminder_id, self.user_id))
             
+            self._data_changed('reminders')
             return True
             
         except sqlite3.Error as e:
             print(f"❌ Error marking reminder as read: {e}")
             return False
     
+    @QUERY_LATENCY.timed
+    def get_active_user_ids(self):
+        """Retrieve the IDs of users who have at least one active goal."""
+        try:
+            with self.db.connection() as conn:
+                rows = conn.execute('''
+                    SELECT DISTINCT user_id FROM goals 
+                    WHERE status = 'active'
+                ''').fetchall()
+            
+            return [row[0] for row in rows]
+            
+        except sqlite3.Error as e:
+            print(f"❌ Error retrieving users: {e}")
+            return []
+    
     def create_daily_reminder(self):
         """Create a daily reminder for one of the user's goals."""
         try:
@@ -337,19 +697,13 @@ class AURA:
             goal_id, goal_text, date_added = random.choice(goals_with_ids)
             
             # Create reminder message
-            reminder_messages = [
-                f"🔔 Daily Reminder: Did you work on '{goal_text}' today?",
-                f"⏰ Time check: Have you made progress on '{goal_text}' today?",
-                f"🎯 Gentle reminder: How did '{goal_text}' go today?",
-                f"💭 Just checking in: Any progress on '{goal_text}' today?",
-                f"🌟 Daily check: Did you take a step toward '{goal_text}' today?"
-            ]
-            
-            reminder_message = random.choice(reminder_messages)
+            reminder_message = reminder_text(goal_text)
             
             # Save the reminder to database
-            if self.save_reminder(goal_id, reminder_message):
+            reminder_id = self.save_reminder(goal_id, reminder_message)
+            if reminder_id:
                 print(f"✅ Daily reminder created for goal: {goal_text}")
+                self._reminder_created(reminder_id, reminder_message, datetime.datetime.now().isoformat(), goal_text)
                 return True
             
             return False
@@ -358,51 +712,131 @@ class AURA:
             print(f"❌ Error creating daily reminder: {e}")
             return False
     
-    def detect_goal(self, user_input):
-        """Check if user input contains a goal statement."""
-        goal_patterns = [
-            r'\bi want to\b',
-            r'\bi\'d like to\b',
-            r'\bi would like to\b',
-            r'\bmy goal is to\b',
-            r'\bi plan to\b',
-            r'\bi hope to\b'
-        ]
+    def create_due_reminders(self, now=None, batch_size=500):
+        """
+        Create a reminder for every goal whose schedule is due, for all users.
         
-        for pattern in goal_patterns:
-            if re.search(pattern, user_input.lower()):
-                return True
-        return False
+        Due schedules are read through the next_due_ts index in batches of
+        batch_size, each batch in one transaction, so the cost follows the
+        number of due reminders rather than the number of goals. Schedules
+        for goals that are gone or no longer active are dropped.
+        Returns the number of reminders created.
+        """
+        now = int(now if now is not None else datetime.datetime.now().timestamp())
+        created = 0
+        
+        while True:
+            try:
+                reminders, inactive = self._create_due_batch(now, batch_size)
+            except sqlite3.Error as e:
+                print(f"❌ Error creating scheduled reminders: {e}")
+                break
+            
+            # Push outside the transaction, as each user
+            users = {user_id: self.for_user(user_id) for user_id, *_ in reminders}
+            for user in users.values():
+                user._data_changed('reminders')
+            for user_id, reminder_id, message, created_at, goal_text in reminders:
+                users[user_id]._reminder_created(reminder_id, message, created_at, goal_text)
+            
+            created += len(reminders)
+            if len(reminders) + inactive < batch_size:
+                break
+        
+        return created
     
-    def detect_mood(self, user_input):
-        """Detect mood keywords in user input and return appropriate empathetic response."""
-        user_lower = user_input.lower()
+    @QUERY_LATENCY.timed
+    def _create_due_batch(self, now, batch_size):
+        """Insert reminders for one batch of due schedules and advance them."""
+        created_at, created_ts = timestamps(datetime.datetime.fromtimestamp(now))
+        reminders, inactive = [], 0
         
-        # Check for explicit mood indicators first (I feel, I'm, etc.)
-        mood_indicators = ["i feel", "i'm feeling", "i am feeling", "feeling", "i am", "i'm"]
-        has_mood_indicator = any(phrase in user_lower for phrase in mood_indicators)
+        with self.db.transaction(immediate=True) as conn:
+            due = conn.execute('''
+                SELECT s.goal_id, s.user_id, s.interval_seconds, s.next_due_ts, g.goal_text, g.status
+                FROM reminder_schedules s
+                LEFT JOIN goals g ON g.id = s.goal_id
+                WHERE s.next_due_ts <= ?
+                ORDER BY s.next_due_ts
+                LIMIT ?
+            ''', (now, batch_size)).fetchall()
+            
+            advanced = []
+            for goal_id, user_id, interval, next_due, goal_text, status in due:
+                if status != 'active':
+                    conn.execute('DELETE FROM reminder_schedules WHERE goal_id = ?', (goal_id,))
+                    inactive += 1
+                    continue
+                
+                message = reminder_text(goal_text)
+                reminder_id = conn.execute(
+                    INSERT_REMINDER_SQL, (user_id, goal_id, message, created_at, created_ts)
+                ).lastrowid
+                reminders.append((user_id, reminder_id, message, created_at, goal_text))
+                
+                # Skip occurrences missed while the scheduler was down
+                next_due += interval
+                if next_due <= now:
+                    next_due = now + interval
+                advanced.append((next_due, now, goal_id))
+            
+            conn.executemany('''
+                UPDATE reminder_schedules SET next_due_ts = ?, last_sent_ts = ?
+                WHERE goal_id = ?
+            ''', advanced)
         
-        # Look for mood keywords in the input
-        detected_mood = None
-        for mood in self.mood_responses.keys():
-            if mood != "default" and mood in user_lower:
-                detected_mood = mood
-                break
+        return reminders, inactive
+    
+    @QUERY_LATENCY.timed
+    def set_reminder_interval(self, goal_id, interval_seconds=DEFAULT_REMINDER_INTERVAL):
+        """Change how often one of the user's goals is reminded, starting from now."""
+        try:
+            with self.db.transaction() as conn:
+                cursor = conn.execute('''
+                    UPDATE reminder_schedules
+                    SET interval_seconds = ?, next_due_ts = ?
+                    WHERE goal_id = ? AND user_id = ?
+                ''', (interval_seconds, timestamps()[1] + interval_seconds, goal_id, self.user_id))
+            
+            return cursor.rowcount > 0
+            
+        except sqlite3.Error as e:
+            print(f"❌ Error updating reminder schedule: {e}")
+            return False
+    
+    def detect_goal(self, user_input):
+        """Check if user input contains a goal statement."""
+        return self.classifier.classify(user_input).is_goal
+    
+    def classify_mood(self, user_input):
+        """
+        Return the mood expressed in user input without logging it:
+        a mood keyword, "other" if there is only a mood indicator, or None.
+        """
+        result = self.classifier.classify(user_input)
         
-        # If we found a mood or have mood indicators, provide a response
-        if detected_mood:
-            # Log the mood in database
-            self.add_mood(detected_mood, user_input)
-            return self.mood_responses[detected_mood]
-        elif has_mood_indicator:
-            # User is expressing a mood but we don't have a specific response
-            # Log it as "other" and use default response
-            self.add_mood("other", user_input)
-            return self.mood_responses["default"]
-        
-        # No mood detected
+        if result.mood:
+            return result.mood
+        elif result.has_indicator:
+            return "other"
         return None
     
+    def detect_mood(self, user_input, when=None):
+        """
+        Detect mood keywords in user input and return appropriate empathetic
+        response. A detected mood is logged at when (default now).
+        """
+        mood = self.classify_mood(user_input)
+        
+        if mood is None:
+            # No mood detected
+            return None
+        
+        # Log the mood in database. "other" means the user is expressing a
+        # mood we don't have a specific response for, so use the default.
+        self.add_mood(mood, user_input, when)
+        return self.mood_responses.get(mood, self.mood_responses["default"])
+    
     def show_startup_goals(self):
         """Display stored goals when AURA starts."""
         goals = self.get_goals()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+AURA Backup
+Takes consistent snapshots of aura_memory.db while the app keeps writing.
+
+The copy goes through SQLite's online backup API a few pages at a time,
+pausing between steps, from a connection holding one read transaction. In
+WAL mode that read transaction doesn't block /chat writes, and it pins the
+snapshot being copied, so writes made during the backup neither restart it
+nor end up half in the copy. Each backup is written to a temporary file,
+verified (integrity check, schema version and row counts against the
+snapshot) and only then renamed into place.
+
+Usage:
+    python backup.py
+    python backup.py --dir backups --keep 14 --pages 512 --sleep 0.01
+    python backup.py --verify backups/aura-20250101-030000.db
+
+To restore, stop the app and copy a verified backup over aura_memory.db.
+
+Author: Mark Mikile Mutunga
+Copyright (c) 2025 Mark Mikile Mutunga. All rights reserved.
+
+This software is licensed under the MIT License.
+See the LICENSE file for full license text.
+"""
+
+import argparse
+import datetime
+import glob
+import os
+import sqlite3
+import time
+
+# Pages copied per step (4 KiB each), and seconds paused between steps
+BACKUP_PAGES = 256
+BACKUP_SLEEP = 0.02
+
+# Tables whose row counts must match between the database and its backup
+VERIFY_TABLES = ('goals', 'moods', 'progress', 'reminders', 'reminder_schedules', 'goal_stats', 'archive_chunks')
+
+# Backups kept in the backup directory; older ones are deleted
+KEEP_BACKUPS = 7
+
+# Seconds between runs of the embedded backup job
+BACKUP_INTERVAL = 24 * 60 * 60
+
+BACKUP_PATTERN = 'aura-*.db'
+
+
+class BackupError(Exception):
+    """A backup that failed verification."""
+
+
+def table_counts(conn, tables=VERIFY_TABLES):
+    """Row counts of the given tables that exist in the database."""
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+            for table in tables if table in existing}
+
+
+def verify_backup(path, expected=None):
+    """
+    Check that a backup file can be restored: it passes PRAGMA
+    integrity_check and, when expected is given, has the same schema
+    version and row counts. Returns {'version': n, 'counts': {...}}.
+    Raises BackupError.
+    """
+    if not os.path.exists(path):
+        raise BackupError(f"{path} does not exist")
+
+    conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        problems = [row[0] for row in conn.execute('PRAGMA integrity_check')]
+        if problems != ['ok']:
+            raise BackupError(f"Integrity check failed: {'; '.join(problems[:5])}")
+
+        found = {
+            'version': conn.execute('PRAGMA user_version').fetchone()[0],
+            'counts': table_counts(conn),
+        }
+    except sqlite3.Error as e:
+        raise BackupError(f"Cannot read {path}: {e}")
+    finally:
+        conn.close()
+
+    if expected is not None and found != expected:
+        raise BackupError(f"Backup doesn't match the database: expected {expected}, found {found}")
+    return found
+
+
+def backup_database(db_name, target, pages=BACKUP_PAGES, sleep=BACKUP_SLEEP, progress=None):
+    """
+    Copy db_name to target online and verify the copy.
+
+    progress(copied, total) is called after each step. Returns
+    {'path', 'pages', 'seconds', 'version', 'counts'}. Raises BackupError
+    (or sqlite3.Error) and leaves no file at target if anything fails.
+    """
+    if not os.path.exists(db_name):
+        raise BackupError(f"{db_name} does not exist")
+
+    started = time.perf_counter()
+    temporary = f'{target}.tmp'
+    if os.path.exists(temporary):
+        os.remove(temporary)
+
+    source = sqlite3.connect(db_name, isolation_level=None)
+    destination = sqlite3.connect(temporary, isolation_level=None)
+    try:
+        # Pin one snapshot: the backup copies it and the counts describe it
+        source.execute('BEGIN')
+        expected = {
+            'version': source.execute('PRAGMA user_version').fetchone()[0],
+            'counts': table_counts(source),
+        }
+        total_pages = source.execute('PRAGMA page_count').fetchone()[0]
+
+        def step(status, remaining, total):
+            if progress is not None:
+                progress(total - remaining, total)
+            # Throttle here: backup()'s own sleep only applies when the source is busy
+            if remaining and sleep:
+                time.sleep(sleep)
+
+        source.backup(destination, pages=pages, progress=step)
+        source.execute('COMMIT')
+
+        # A single self-contained file, without -wal / -shm companions
+        destination.execute('PRAGMA journal_mode = DELETE')
+    except BaseException:
+        destination.close()
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    finally:
+        source.close()
+    destination.close()
+
+    try:
+        verify_backup(temporary, expected)
+    except BackupError:
+        os.remove(temporary)
+        raise
+    os.replace(temporary, target)
+
+    return {
+        'path': target,
+        'pages': total_pages,
+        'seconds': time.perf_counter() - started,
+        **expected,
+    }
+
+
+def prune_backups(directory, keep=KEEP_BACKUPS):
+    """Delete all but the newest `keep` backups in directory. Returns the deleted paths."""
+    backups = sorted(glob.glob(os.path.join(directory, BACKUP_PATTERN)))
+    stale = backups[:-keep] if keep > 0 else backups
+    for path in stale:
+        os.remove(path)
+    return stale
+
+
+def run_backup(db_name, directory, keep=KEEP_BACKUPS, **options):
+    """Back up into a new timestamped file in directory, then prune old ones. Returns backup_database()'s result."""
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    result = backup_database(db_name, os.path.join(directory, f'aura-{stamp}.db'), **options)
+    prune_backups(directory, keep)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Back up the AURA database while it is in use")
+    parser.add_argument('--db', default='aura_memory.db', help="Database file")
+    parser.add_argument('--dir', default='backups', help="Directory for backups (default: backups)")
+    parser.add_argument('--keep', type=int, default=KEEP_BACKUPS, help="Backups to keep")
+    parser.add_argument('--pages', type=int, default=BACKUP_PAGES, help="Pages copied per step")
+    parser.add_argument('--sleep', type=float, default=BACKUP_SLEEP, help="Seconds to pause between steps")
+    parser.add_argument('--verify', metavar='FILE', help="Only verify an existing backup")
+    args = parser.parse_args()
+
+    try:
+        if args.verify:
+            found = verify_backup(args.verify)
+            counts = ', '.join(f"{count:,} {table}" for table, count in found['counts'].items())
+            print(f"✅ {args.verify} is intact (schema version {found['version']}; {counts})")
+            return
+
+        shown = [-1]
+
+        def report(copied, total):
+            percent = copied * 100 // max(total, 1)
+            if percent // 10 != shown[0]:
+                shown[0] = percent // 10
+                print(f"💾 {percent:3d}% ({copied:,} / {total:,} pages)")
+
+        result = run_backup(args.db, args.dir, args.keep, pages=args.pages, sleep=args.sleep, progress=report)
+        print(f"✅ Backed up {args.db} to {result['path']} ({result['pages']:,} pages, "
+              f"{result['seconds']:.1f}s), verified")
+
+    except (BackupError, sqlite3.Error, OSError) as e:
+        print(f"❌ {'Verification' if args.verify else 'Backup'} failed: {e}")
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
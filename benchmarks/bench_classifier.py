@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Message classifier microbenchmark.
+
+Runs the old per-message loops (six re.search calls for goals, substring
+scans for moods and indicators) and the compiled MessageClassifier over the
+same synthetic corpus and reports messages/sec for each.
+
+Usage:
+    python benchmarks/bench_classifier.py [--messages 200000] [--seed 7]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from classifier import MessageClassifier, GOAL_PHRASES, MOOD_INDICATORS
+
+MOODS = [
+    "tired", "stressed", "unmotivated", "happy", "sad", "anxious", "overwhelmed",
+    "frustrated", "lonely", "excited", "worried", "confused",
+]
+
+FILLER = (
+    "today work the a meeting coffee python project walk dinner family code "
+    "weekend book read gym morning evening really quite very so and but"
+).split()
+
+
+def make_corpus(count, seed):
+    """Build synthetic chat messages mixing filler words with goal/mood phrases."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        words = rng.choices(FILLER, k=rng.randint(4, 25))
+        roll = rng.random()
+        if roll < 0.2:
+            words.insert(0, rng.choice(GOAL_PHRASES))
+        elif roll < 0.6:
+            words.insert(rng.randint(0, len(words)), rng.choice(MOODS))
+            if roll < 0.4:
+                words.insert(0, rng.choice(MOOD_INDICATORS))
+        corpus.append(" ".join(words).capitalize())
+    return corpus
+
+
+def legacy_classify(text):
+    """The original detect_goal/detect_mood logic, minus the database write."""
+    goal_patterns = [
+        r'\bi want to\b', r'\bi\'d like to\b', r'\bi would like to\b',
+        r'\bmy goal is to\b', r'\bi plan to\b', r'\bi hope to\b'
+    ]
+    is_goal = any(re.search(pattern, text.lower()) for pattern in goal_patterns)
+
+    user_lower = text.lower()
+    has_indicator = any(phrase in user_lower for phrase in MOOD_INDICATORS)
+    mood = next((m for m in MOODS if m in user_lower), None)
+    return is_goal, mood, has_indicator
+
+
+def time_it(label, func, corpus):
+    """Run func over the corpus and print messages/sec."""
+    start = time.perf_counter()
+    for text in corpus:
+        func(text)
+    elapsed = time.perf_counter() - start
+    rate = len(corpus) / elapsed
+    print(f"   {label:<24} {rate:12,.0f} msg/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AURA's goal/mood classifier")
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.messages, args.seed)
+    classifier = MessageClassifier(MOODS, cache_size=0)
+
+    print(f"📊 Classifying {len(corpus):,} synthetic messages\n")
+    before = time_it("legacy loops", legacy_classify, corpus)
+    after = time_it("compiled classifier", classifier.classify, corpus)
+    print(f"\n   Speed-up: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
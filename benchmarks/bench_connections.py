@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Connection pool benchmark.
+
+Compares the old connect-per-call behaviour (pooled=False) with the pooled
+connection layer (pooled=True) on a chat-like workload, first directly
+against AURA and then through the Flask test client for POST /chat.
+
+Usage:
+    python benchmarks/bench_connections.py [--requests 2000] [--threads 4]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from aura import AURA
+
+MESSAGES = [
+    "I feel tired after work",
+    "I want to learn Python",
+    "I'm feeling happy today",
+    "goals",
+    "Just had lunch",
+]
+
+
+def run_threads(worker, total, threads):
+    """Split `total` calls across `threads` threads and return calls/sec."""
+    per_thread = total // threads
+
+    def loop():
+        for i in range(per_thread):
+            worker(i)
+
+    pool = [threading.Thread(target=loop) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return (per_thread * threads) / elapsed
+
+
+def bench_aura(pooled, total, threads):
+    """Drive AURA's data methods the way process_message does."""
+    with tempfile.TemporaryDirectory() as tmp:
+        aura = AURA(db_name=os.path.join(tmp, "bench.db"), pooled=pooled)
+        aura.add_goal("I want to benchmark AURA")
+
+        def worker(i):
+            message = MESSAGES[i % len(MESSAGES)]
+            if message == "goals":
+                aura.get_goals()
+            elif not aura.detect_goal(message):
+                aura.detect_mood(message)
+            aura.get_unread_reminders()
+
+        rate = run_threads(worker, total, threads)
+        aura.close()
+        return rate
+
+
+def bench_flask(pooled, total, threads):
+    """POST /chat through the Flask test client. Returns None without Flask."""
+    try:
+        import app as web_app
+    except ImportError:
+        return None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        original = web_app.web_aura
+        web_app.web_aura = web_app.WebAURA(db_name=os.path.join(tmp, "bench.db"), pooled=pooled)
+        local = threading.local()
+
+        def worker(i):
+            client = getattr(local, "client", None)
+            if client is None:
+                client = local.client = web_app.app.test_client()
+            client.post("/chat", json={"message": MESSAGES[i % len(MESSAGES)]})
+
+        try:
+            return run_threads(worker, total, threads)
+        finally:
+            web_app.web_aura.close()
+            web_app.web_aura = original
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AURA's connection layer")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"📊 {args.requests} calls across {args.threads} threads\n")
+    for label, bench in (("AURA data methods", bench_aura), ("POST /chat", bench_flask)):
+        before = bench(False, args.requests, args.threads)
+        if before is None:
+            print(f"{label}: skipped (Flask not installed)")
+            continue
+        after = bench(True, args.requests, args.threads)
+        print(f"{label}:")
+        print(f"   per-call connections: {before:10.1f} req/s")
+        print(f"   pooled connections:   {after:10.1f} req/s  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+First-message latency benchmark.
+
+Seeds a user with goals and pending reminders, then alternates
+session-opening messages (greeting + reply) with ordinary ones through
+WebAURA.respond and prints the p50/p99 that respond() records for each.
+
+Usage:
+    python benchmarks/bench_first_message.py [--goals 2000] [--requests 2000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Keep the embedded reminder job out of the measurements
+os.environ.setdefault('AURA_EMBEDDED_SCHEDULER', '0')
+
+from metrics import CHAT_LATENCY
+
+MESSAGES = [
+    "I feel tired after work",
+    "I'm feeling happy today",
+    "Just had lunch",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark first-message vs normal /chat latency")
+    parser.add_argument("--goals", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # app builds its global WebAURA on import, so point it at the
+        # benchmark database rather than ./aura_memory.db
+        os.environ['AURA_DB'] = os.path.join(tmp, "bench.db")
+        from app import WebAURA
+
+        aura = WebAURA(db_name=os.environ['AURA_DB'])
+        now = int(time.time())
+        with aura.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO goals (user_id, goal_text, date_added, added_ts) VALUES (?, ?, ?, ?)",
+                [(aura.user_id, f"Goal number {i}", "2025-01-01T09:00:00", now - i) for i in range(args.goals)]
+            )
+
+        for i in range(args.requests):
+            if i % 50 == 0:
+                aura.save_reminder(1, "🔔 Daily Reminder: benchmark")
+            aura.respond(MESSAGES[i % len(MESSAGES)], first_message=i % 2 == 0)
+
+        print(f"📊 {args.requests:,} replies, {args.goals:,} goals\n")
+        for (kind,), stats in sorted(CHAT_LATENCY.summary().items()):
+            print(f"   {kind:<14} mean {stats['mean'] * 1000:7.2f} ms   "
+                  f"p50 ≤ {stats['p50'] * 1000:6.1f} ms   p99 ≤ {stats['p99'] * 1000:6.1f} ms")
+        aura.close()
+
+
+if __name__ == "__main__":
+    main()
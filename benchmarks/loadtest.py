@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Web server load test.
+
+Opens many keep-alive connections, most of them idle (like browser tabs
+polling for reminders), and drives POST /chat from the rest for a fixed
+duration. Reports requests/sec and latency percentiles for each URL, so the
+Flask server and the ASGI server can be compared side by side.
+
+Usage:
+    python app.py                                  # Flask on :5000
+    uvicorn asgi_app:app --port 8000               # ASGI on :8000
+    python benchmarks/loadtest.py --url http://127.0.0.1:5000 --url http://127.0.0.1:8000 \\
+        [--active 64] [--idle 500] [--duration 10]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from urllib.parse import urlsplit
+
+MESSAGES = [
+    "I'm feeling tired today",
+    "I want to read more books",
+    "feeling happy about the weekend",
+    "I am stressed about work",
+    "goals",
+    "I hope to run a marathon",
+]
+
+
+async def request(reader, writer, host, path, body):
+    """Send one HTTP/1.1 request on an open connection and read the response."""
+    payload = json.dumps(body).encode('utf-8')
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\nConnection: keep-alive\r\n\r\n".encode('ascii') + payload
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def active_client(host, port, deadline, latencies, errors):
+    """Send chat messages back to back until the deadline."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                status = await request(reader, writer, f"{host}:{port}", '/chat',
+                                       {'message': random.choice(MESSAGES)})
+            except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+                errors.append(1)
+                writer.close()
+                reader, writer = await asyncio.open_connection(host, port)
+                continue
+            if status == 200:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def idle_client(host, port, deadline):
+    """Hold a connection open without sending anything."""
+    try:
+        _, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        return
+    await asyncio.sleep(max(deadline - time.perf_counter(), 0))
+    writer.close()
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    return values[min(int(len(values) * pct / 100), len(values) - 1)]
+
+
+async def run(url, active, idle, duration):
+    """Load one server and return its stats."""
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    deadline = time.perf_counter() + duration
+    latencies, errors = [], []
+
+    await asyncio.gather(
+        *(idle_client(host, port, deadline) for _ in range(idle)),
+        *(active_client(host, port, deadline, latencies, errors) for _ in range(active)),
+        return_exceptions=True,
+    )
+
+    latencies.sort()
+    return {
+        'url': url,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'rps': round(len(latencies) / duration, 1),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test AURA's /chat endpoint")
+    parser.add_argument('--url', action='append', required=True, help="Server base URL (repeatable)")
+    parser.add_argument('--active', type=int, default=64, help="Connections sending requests")
+    parser.add_argument('--idle', type=int, default=500, help="Idle keep-alive connections")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per server")
+    args = parser.parse_args()
+
+    print(f"📊 {args.active} active + {args.idle} idle connections, {args.duration:g}s per server\n")
+    for url in args.url:
+        stats = asyncio.run(run(url, args.active, args.idle, args.duration))
+        print(f"   {stats['url']:<28} {stats['rps']:10,.1f} req/s   "
+              f"p50 {stats['p50_ms']:8.2f} ms   p99 {stats['p99_ms']:8.2f} ms   "
+              f"errors {stats['errors']}")
+
+
+if __name__ == '__main__':
+    main()
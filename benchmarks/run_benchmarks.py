@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+AURA benchmark suite.
+
+Seeds a synthetic database of the requested size, then measures:
+    classify        detect_goal / classify_mood throughput
+    detect_mood     detect_mood throughput (classification + mood insert)
+    add_mood        mood insert rate
+    save_progress   progress insert rate
+    mood_analytics / progress_analytics / long_range_stats
+                    dashboard query latency, cold (cache invalidated) and warm
+    http_chat / http_data
+                    POST /chat and GET /data through the Flask test client
+
+and writes every result, with the seed sizes and environment, as JSON so
+runs can be compared over time. Web benchmarks are skipped (and reported as
+such) when Flask isn't installed, long_range_stats when NumPy isn't.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --goals 5000 --moods 500000 --progress 500000 \\
+        --reminders 50000 --users 100 --output results/baseline.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Keep the embedded reminder job out of the measurements
+os.environ.setdefault('AURA_EMBEDDED_SCHEDULER', '0')
+
+import analytics
+from aura import AURA, INSERT_GOAL_SQL, INSERT_MOOD_SQL, INSERT_PROGRESS_SQL, INSERT_REMINDER_SQL, timestamps
+from bench_classifier import make_corpus, MOODS
+from dedupe import index_goal
+
+STATUSES = ('yes', 'no', 'maybe')
+
+
+def seed_database(db_name, goals, moods, progress, reminders, users, days, seed):
+    """Fill a fresh database with synthetic rows spread over the last `days` days."""
+    rng = random.Random(seed)
+    aura = AURA(db_name=db_name)
+    user_ids = ['default'] + [f'user{i}' for i in range(1, users)]
+    now = datetime.datetime.now()
+
+    def when():
+        return timestamps(now - datetime.timedelta(seconds=rng.randrange(days * 86400)))
+
+    with aura.db.transaction() as conn:
+        goal_rows = [(rng.choice(user_ids), f"Synthetic goal {i}", *when()) for i in range(goals)]
+        conn.executemany(INSERT_GOAL_SQL, goal_rows)
+        goal_owner = {i + 1: row[0] for i, row in enumerate(goal_rows)}
+        # Keep the near-duplicate index in step, as add_goal would
+        for goal_id, (user_id, goal_text, *_) in enumerate(goal_rows, 1):
+            index_goal(conn, goal_id, user_id, goal_text)
+
+        conn.executemany(INSERT_MOOD_SQL, (
+            (rng.choice(user_ids), rng.choice(MOODS), "synthetic", *when()) for _ in range(moods)
+        ))
+        if goal_owner:
+            goal_ids = list(goal_owner)
+            conn.executemany(INSERT_PROGRESS_SQL, (
+                (goal_owner[goal_id], goal_id, rng.choice(STATUSES), *when())
+                for goal_id in (rng.choice(goal_ids) for _ in range(progress))
+            ))
+            conn.executemany(INSERT_REMINDER_SQL, (
+                (goal_owner[goal_id], goal_id, "🔔 Synthetic reminder", *when())
+                for goal_id in (rng.choice(goal_ids) for _ in range(reminders))
+            ))
+    aura.close()
+
+
+def measure(func, iterations, warmup=0):
+    """Call func() repeatedly and summarise its latency and throughput."""
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - started
+
+    samples.sort()
+    return {
+        'iterations': iterations,
+        'ops_per_sec': round(iterations / elapsed, 1),
+        'mean_ms': round(elapsed / iterations * 1000, 4),
+        'p50_ms': round(samples[len(samples) // 2] * 1000, 4),
+        'p99_ms': round(samples[min(int(len(samples) * 0.99), len(samples) - 1)] * 1000, 4),
+    }
+
+
+def cycle(items):
+    """Return a function handing out items round-robin."""
+    state = {'i': -1}
+
+    def next_item():
+        state['i'] = (state['i'] + 1) % len(items)
+        return items[state['i']]
+    return next_item
+
+
+def bench_core(db_name, iterations, seed):
+    """Classification and write-rate benchmarks against AURA."""
+    aura = AURA(db_name=db_name)
+    corpus = make_corpus(max(iterations, 1000), seed)
+    results = {}
+
+    # Unique messages, so the classifier's LRU cache doesn't flatter the numbers
+    aura.classifier.classify.cache_clear()
+    text = cycle(corpus)
+
+    def classify():
+        message = text()
+        aura.detect_goal(message)
+        aura.classify_mood(message)
+    results['classify'] = measure(classify, iterations)
+
+    aura.classifier.classify.cache_clear()
+    results['detect_mood'] = measure(lambda: aura.detect_mood(text()), iterations)
+
+    mood = cycle(MOODS)
+    results['add_mood'] = measure(lambda: aura.add_mood(mood(), "benchmark"), iterations)
+
+    goal_ids = [row[0] for row in aura.get_goals_with_ids(limit=100)] or [1]
+    goal = cycle(goal_ids)
+    status = cycle(STATUSES)
+    results['save_progress'] = measure(lambda: aura.save_progress(goal(), status()), iterations)
+
+    # Each new goal is checked against the seeded ones for near-duplicates first
+    phrase = cycle([f"practise benchmark skill {i}" for i in range(iterations)])
+    results['add_goal'] = measure(lambda: aura.add_goal(f"I want to {phrase()}"), iterations)
+
+    aura.close()
+    return results
+
+
+def bench_web(db_name, iterations):
+    """Analytics latency and Flask request throughput. Returns None without Flask."""
+    # app builds its global WebAURA on import; point it at the benchmark database
+    os.environ['AURA_DB'] = db_name
+    try:
+        import app as web_app
+    except ImportError:
+        return None
+
+    original = web_app.web_aura
+    web_aura = web_app.web_aura = web_app.WebAURA(db_name=db_name)
+    results = {}
+    try:
+        queries = [('mood_analytics', web_aura.get_mood_analytics),
+                   ('progress_analytics', web_aura.get_goal_progress_analytics)]
+        if analytics.available():
+            queries.append(('long_range_stats', web_aura.get_long_range_stats))
+        for name, query in queries:
+            def cold():
+                web_aura.analytics_cache.clear()
+                query()
+            results[f'{name}_cold'] = measure(cold, max(iterations // 10, 10))
+            results[f'{name}_warm'] = measure(query, iterations, warmup=1)
+
+        client = web_app.app.test_client()
+        message = cycle(["I feel tired after work", "I'm feeling happy today", "goals", "Just had lunch"])
+        results['http_chat'] = measure(lambda: client.post('/chat', json={'message': message()}), iterations)
+        results['http_data'] = measure(lambda: client.get('/data'), iterations)
+    finally:
+        web_aura.close()
+        web_app.web_aura = original
+    return results
+
+
+def environment():
+    """Describe the machine and code version the numbers came from."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run AURA's benchmark suite and write JSON results")
+    parser.add_argument('--goals', type=int, default=1000)
+    parser.add_argument('--moods', type=int, default=100000)
+    parser.add_argument('--progress', type=int, default=100000)
+    parser.add_argument('--reminders', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=10, help="Users the rows are spread across")
+    parser.add_argument('--days', type=int, default=365, help="Days of history to spread rows over")
+    parser.add_argument('--iterations', type=int, default=2000, help="Calls per benchmark")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', help="Write JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    sizes = {name: getattr(args, name) for name in ('goals', 'moods', 'progress', 'reminders', 'users', 'days')}
+    report = {'environment': environment(), 'seed': args.seed, 'sizes': sizes,
+              'iterations': args.iterations, 'results': {}, 'skipped': []}
+
+    # AURA's status prints go to stderr so stdout stays pure JSON
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(sys.stderr):
+        db_name = os.path.join(tmp, 'bench.db')
+
+        started = time.perf_counter()
+        seed_database(db_name, seed=args.seed, **sizes)
+        report['seed_seconds'] = round(time.perf_counter() - started, 3)
+        print(f"🌱 Seeded {sizes} in {report['seed_seconds']}s", file=sys.stderr)
+
+        report['results'].update(bench_core(db_name, args.iterations, args.seed))
+        web = bench_web(db_name, args.iterations)
+        if web is None:
+            report['skipped'] += ['mood_analytics', 'progress_analytics', 'http_chat', 'http_data']
+            print("⏭️  Web benchmarks skipped (Flask not installed)", file=sys.stderr)
+        else:
+            report['results'].update(web)
+            if not analytics.available():
+                report['skipped'].append('long_range_stats')
+
+    for name, result in report['results'].items():
+        print(f"   {name:<26} {result['ops_per_sec']:>12,.1f} ops/s   "
+              f"p50 {result['p50_ms']:8.3f} ms   p99 {result['p99_ms']:8.3f} ms", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            handle.write(output + '\n')
+        print(f"💾 Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+AURA Reminder Broker
+In-process publish/subscribe for pushing new reminders to open browser tabs.
+
+Author: Mark Mikile Mutunga
+Copyright (c) 2025 Mark Mikile Mutunga. All rights reserved.
+
+This software is licensed under the MIT License.
+See the LICENSE file for full license text.
+"""
+
+import json
+import threading
+
+# Seconds between keep-alive comments on an idle event stream, so proxies
+# keep the connection open and servers notice clients that went away
+KEEPALIVE_INTERVAL = 15
+
+
+class ReminderBroker:
+    """
+    Routes reminders to the streams a user has open.
+
+    A subscriber is any callable taking one reminder dict; it is called from
+    the publishing thread (usually the scheduler), so it must only hand the
+    reminder off: queue.Queue.put for threads, or call_soon_threadsafe for
+    an asyncio loop.
+    """
+
+    def __init__(self):
+        self._subscribers = {}  # user_id -> set of deliver callables
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id, deliver):
+        """Start sending the user's reminders to deliver(reminder)."""
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(deliver)
+
+    def unsubscribe(self, user_id, deliver):
+        """Stop sending reminders to deliver."""
+        with self._lock:
+            subscribers = self._subscribers.get(user_id)
+            if subscribers is None:
+                return
+            subscribers.discard(deliver)
+            if not subscribers:
+                del self._subscribers[user_id]
+
+    def publish(self, user_id, reminder):
+        """Send a reminder to every open stream of the user. Returns how many got it."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+
+        delivered = 0
+        for deliver in subscribers:
+            try:
+                deliver(reminder)
+                delivered += 1
+            except Exception as e:
+                print(f"❌ Error pushing reminder: {e}")
+        return delivered
+
+    def has_subscribers(self, user_id):
+        """Whether the user has any stream open."""
+        with self._lock:
+            return user_id in self._subscribers
+
+    def subscribed_users(self):
+        """IDs of users with at least one stream open."""
+        with self._lock:
+            return list(self._subscribers)
+
+    def subscriber_count(self):
+        """Total number of open streams, across users."""
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+def sse_event(reminder):
+    """Encode a reminder as a Server-Sent Events message."""
+    return f"id: {reminder['id']}\ndata: {json.dumps(reminder)}\n\n"
+
+
+def sse_keepalive():
+    """An SSE comment line, ignored by EventSource."""
+    return ": keep-alive\n\n"
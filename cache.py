@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+AURA Result Cache
+A small in-process TTL cache for query results, invalidated by table.
+
+Author: Mark Mikile Mutunga
+Copyright (c) 2025 Mark Mikile Mutunga. All rights reserved.
+
+This software is licensed under the MIT License.
+See the LICENSE file for full license text.
+"""
+
+import threading
+import time
+
+
+class ResultCache:
+    """
+    Caches computed results under a key, tagged with the tables they read.
+
+    invalidate('moods') drops every entry that depends on moods. The TTL
+    bounds staleness for writes this process can't see (other workers,
+    date windows rolling over at midnight).
+    """
+
+    def __init__(self, ttl=60.0, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}      # key -> (expires_at, tables, value)
+        self._generations = {}  # table -> number of invalidations so far
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, tables, compute):
+        """Return the cached value for key, computing and storing it on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[2]
+            generations = [self._generations.get(table, 0) for table in tables]
+
+        value = compute()
+
+        with self._lock:
+            # Skip storing if a write landed while we were computing
+            if generations == [self._generations.get(table, 0) for table in tables]:
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+                self._entries[key] = (time.monotonic() + self.ttl, frozenset(tables), value)
+        return value
+
+    def invalidate(self, *tables):
+        """Drop every entry that depends on any of the given tables."""
+        changed = set(tables)
+        with self._lock:
+            for table in changed:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [key for key, (_, deps, _) in self._entries.items() if deps & changed]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
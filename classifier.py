@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+AURA Message Classifier
+Finds goal phrases, mood keywords and mood indicators in one regex pass.
+
+Author: Mark Mikile Mutunga
+Copyright (c) 2025 Mark Mikile Mutunga. All rights reserved.
+
+This software is licensed under the MIT License.
+See the LICENSE file for full license text.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# Phrases that mark a message as a goal statement
+GOAL_PHRASES = (
+    "i want to",
+    "i'd like to",
+    "i would like to",
+    "my goal is to",
+    "i plan to",
+    "i hope to",
+)
+
+# Phrases that mean the user is describing how they feel
+MOOD_INDICATORS = ("i feel", "i'm feeling", "i am feeling", "feeling", "i am", "i'm")
+
+# One hit in a message: kind is 'goal', 'mood' or 'indicator'
+Match = namedtuple("Match", ["kind", "label", "start", "end"])
+
+# Result of classifying a message. mood is None when no keyword matched.
+Classification = namedtuple("Classification", ["is_goal", "mood", "has_indicator", "matches"])
+
+
+class MessageClassifier:
+    """
+    Compiles every goal phrase, mood keyword and indicator into a single
+    alternation, built once, so a message is scanned once no matter how
+    many terms there are. Terms only match on word boundaries ("unhappy"
+    is not "happy"), and longer terms win over their prefixes.
+    """
+
+    def __init__(self, moods, goal_phrases=GOAL_PHRASES, indicators=MOOD_INDICATORS, cache_size=1024):
+        # Mood priority follows the order given, like the old dict scan
+        self.mood_priority = {mood: i for i, mood in enumerate(moods)}
+
+        self.terms = {}
+        for kind, phrases in (("indicator", indicators), ("mood", moods), ("goal", goal_phrases)):
+            for phrase in phrases:
+                self.terms[phrase.lower()] = kind
+
+        alternation = "|".join(re.escape(term) for term in sorted(self.terms, key=len, reverse=True))
+        self.pattern = re.compile(rf"\b(?:{alternation})\b")
+
+        # detect_goal and detect_mood run on the same message back to back
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    def scan(self, text):
+        """Return every match in the text, in order, with positions in text.lower()."""
+        return [
+            Match(self.terms[m.group()], m.group(), m.start(), m.end())
+            for m in self.pattern.finditer(text.lower())
+        ]
+
+    def _classify(self, text):
+        """Scan the text once and summarise the matches."""
+        matches = tuple(self.scan(text))
+        moods = [match.label for match in matches if match.kind == "mood"]
+        return Classification(
+            is_goal=any(match.kind == "goal" for match in matches),
+            mood=min(moods, key=self.mood_priority.__getitem__) if moods else None,
+            has_indicator=any(match.kind == "indicator" for match in matches),
+            matches=matches,
+        )
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+AURA Database Layer
+Long-lived, pooled SQLite connections shared by AURA and WebAURA.
+
+Author: Mark Mikile Mutunga
+Copyright (c) 2025 Mark Mikile Mutunga. All rights reserved.
+
+This software is licensed under the MIT License.
+See the LICENSE file for full license text.
+"""
+
+import sqlite3
+import threading
+import queue
+import itertools
+from contextlib import contextmanager
+
+# Pragmas applied to every new connection. WAL lets readers (the dashboard)
+# run alongside the writer (chat + scheduler), and synchronous=NORMAL is
+# durable in WAL mode without an fsync on every commit. auto_vacuum has to
+# come before the switch to WAL and only takes effect on a new database
+# (older ones need `python retention.py --full-vacuum` once).
+CONNECTION_PRAGMAS = (
+    "PRAGMA auto_vacuum = INCREMENTAL",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -8000",
+    "PRAGMA busy_timeout = 5000",
+)
+
+
+class ConnectionManager:
+    """
+    Hands out SQLite connections from a bounded pool.
+
+    Connections are opened lazily, kept open between calls and reused, so
+    each one keeps its own prepared-statement cache warm. A thread that
+    already holds a connection gets the same one back from nested calls,
+    which lets a transaction() span several AURA methods.
+
+    With pooled=False every checkout opens a fresh connection and closes it
+    on release (the old per-call behaviour, kept for benchmarking).
+    """
+
+    def __init__(self, db_name, pooled=True, pool_size=8, timeout=30.0,
+                 cached_statements=256):
+        self.db_name = db_name
+        self.pooled = pooled
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+
+        self._idle = queue.LifoQueue()
+        self._all = set()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._closed = False
+
+        # Counters for stats()
+        self._in_use = 0
+        self._opened = 0
+        self._checkouts = 0
+
+    def _open(self):
+        """Open and configure a new connection."""
+        self._opened += 1
+        conn = sqlite3.connect(
+            self.db_name,
+            timeout=self.timeout,
+            isolation_level=None,  # Transactions are managed explicitly
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _acquire(self):
+        """Take an idle connection, open a new one, or wait for one."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection manager is closed")
+
+        if not self.pooled:
+            return self._open()
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._all) < self.pool_size:
+                conn = self._open()
+                self._all.add(conn)
+                return conn
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Timed out waiting for a database connection")
+
+    def _release(self, conn):
+        """Return a connection to the pool (or close it)."""
+        if conn.in_transaction:
+            conn.rollback()
+
+        if not self.pooled or self._closed:
+            with self._lock:
+                self._all.discard(conn)
+            conn.close()
+            return
+
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of the with-block."""
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            yield held
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._local.conn = None
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self, immediate=False):
+        """
+        Run the with-block in a single transaction.
+
+        Nested calls join the outer transaction. immediate=True takes the
+        write lock up front, for read-then-write sequences.
+        """
+        with self.connection() as conn:
+            if conn.in_transaction:
+                yield conn
+                return
+
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+
+    def in_transaction(self):
+        """Whether this thread is inside a transaction() block."""
+        conn = getattr(self._local, "conn", None)
+        return conn is not None and conn.in_transaction
+
+    def stats(self):
+        """Connection counts: open in the pool, in use, and totals opened / checked out."""
+        with self._lock:
+            return {
+                'pooled': len(self._all),
+                'in_use': self._in_use,
+                'opened_total': self._opened,
+                'checkouts_total': self._checkouts,
+            }
+
+    def close(self):
+        """Close every pooled connection. Safe to call more than once."""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._all.discard(conn)
+            conn.close()
+
+
+def is_busy_error(error):
+    """Whether a sqlite3 error means the database was busy or locked (worth retrying)."""
+    code = getattr(error, 'sqlite_errorcode', None)
+    if code is not None:
+        return code & 0xff in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    return isinstance(error, sqlite3.OperationalError) and ('locked' in str(error) or 'busy' in str(error))
+
+
+class WriteBehindQueue:
+    """
+    Buffers INSERT statements in memory and writes them in batches.
+
+    A background thread flushes the buffer in a single transaction once it
+    holds max_batch statements or flush_interval seconds have passed, so
+    callers never wait on a commit. If the buffer backs up past max_pending
+    the caller flushes inline instead of growing memory without bound.
+    A batch that fails because the database is busy is retried up to
+    max_retries times; after that, or on any other error, it is dropped.
+    """
+
+    def __init__(self, manager, max_batch=200, flush_interval=1.0, max_pending=10000, max_retries=5):
+        self.manager = manager
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+
+        # Consecutive failed flushes of the batch at the front, and rows given up on
+        self._retries = 0
+        self.dropped = 0
+
+        self._pending = []
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="aura-write-behind", daemon=True)
+        self._thread.start()
+
+    def put(self, sql, params):
+        """Queue one statement for the next flush."""
+        with self._cond:
+            if self._stopped:
+                raise sqlite3.ProgrammingError("Write-behind queue is closed")
+            self._pending.append((sql, params))
+            size = len(self._pending)
+            if size >= self.max_batch:
+                self._cond.notify()
+
+        if size >= self.max_pending:
+            self.flush()
+
+    def pending(self):
+        """Number of statements waiting to be written."""
+        with self._cond:
+            return len(self._pending)
+
+    def flush(self):
+        """Write everything queued so far in one transaction. Returns the row count."""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+
+            try:
+                with self.manager.transaction() as conn:
+                    # Consecutive statements with the same SQL go out as one executemany
+                    for sql, group in itertools.groupby(batch, key=lambda item: item[0]):
+                        conn.executemany(sql, [params for _, params in group])
+            except sqlite3.Error as e:
+                # Busy/locked database: keep the batch and retry on the next
+                # flush, a few times. Anything else won't go away by retrying.
+                if is_busy_error(e) and self._retries < self.max_retries:
+                    self._retries += 1
+                    print(f"❌ Error flushing {len(batch)} queued writes, will retry: {e}")
+                    with self._cond:
+                        self._pending[:0] = batch
+                    return 0
+
+                self._retries = 0
+                self.dropped += len(batch)
+                print(f"❌ Error flushing {len(batch)} queued writes, dropping them: {e}")
+                return 0
+
+            self._retries = 0
+            return len(batch)
+
+    def _run(self):
+        """Background flusher loop."""
+        while True:
+            with self._cond:
+                if not self._stopped and len(self._pending) < self.max_batch:
+                    self._cond.wait(self.flush_interval)
+                stopped = self._stopped
+            self.flush()
+            if stopped:
+                return
+
+    def close(self):
+        """Stop the background thread and flush whatever is left."""
+        with self._cond:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+AURA Goal Deduplication
+Finds an existing active goal that says the same thing as a new one.
+
+Every goal gets a signature (lower-cased words minus goal phrases and
+filler, sorted) and its set of word trigrams, stored in goal_signatures and
+goal_trigrams, with postings per trigram counted in goal_trigram_counts.
+A new goal's candidates come from the postings of only its rarest
+trigrams, limited to goals of compatible size, so a lookup reads a small
+slice of the index however many goals the user has.
+
+Author: Mark Mikile Mutunga
+Copyright (c) 2025 Mark Mikile Mutunga. All rights reserved.
+
+This software is licensed under the MIT License.
+See the LICENSE file for full license text.
+"""
+
+import math
+import re
+
+from classifier import GOAL_PHRASES
+
+# Jaccard similarity of trigram sets at or above which two goals are the same
+# goal ("Learn Python" / "learn more python!" = 1.0, but "Run a marathon" /
+# "Run a half marathon" = 0.72)
+DUPLICATE_THRESHOLD = 0.75
+
+# Words that don't change what a goal is about
+FILLER_WORDS = frozenset(('a', 'an', 'the', 'to', 'my', 'i', 'more', 'some', 'really', 'just', 'also'))
+
+_GOAL_PREFIX = re.compile(
+    r'^(?:' + '|'.join(re.escape(phrase) for phrase in sorted(GOAL_PHRASES, key=len, reverse=True)) + r')\s*'
+)
+
+
+def goal_signature(goal_text):
+    """Normalized form of a goal: its distinct meaningful words, sorted."""
+    text = _GOAL_PREFIX.sub('', goal_text.lower().strip())
+    return ' '.join(sorted({word for word in re.findall(r'\w+', text) if word not in FILLER_WORDS}))
+
+
+def trigrams(signature):
+    """Word trigrams of a signature, each word padded as '  word ' (as pg_trgm does)."""
+    grams = set()
+    for word in signature.split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def index_goal(conn, goal_id, user_id, goal_text):
+    """Store a new goal's signature and trigrams so later goals can be matched against it."""
+    signature = goal_signature(goal_text)
+    grams = trigrams(signature)
+    conn.execute(
+        'INSERT INTO goal_signatures (goal_id, user_id, signature) VALUES (?, ?, ?)',
+        (goal_id, user_id, signature)
+    )
+    conn.executemany(
+        'INSERT INTO goal_trigrams (user_id, trigram, size, goal_id) VALUES (?, ?, ?, ?)',
+        ((user_id, gram, len(grams), goal_id) for gram in grams)
+    )
+
+
+def find_duplicate(conn, user_id, goal_text, threshold=DUPLICATE_THRESHOLD):
+    """
+    The user's most similar active goal at or above threshold, as
+    (goal id, goal text, similarity), or None.
+
+    Jaccard similarity >= t between goals of a and b trigrams needs b within
+    [t*a, a/t] and at least ceil(t*a) shared trigrams, so a match must
+    contain one of any a - ceil(t*a) + 1 of the new goal's trigrams. Only
+    that many of the rarest are looked up, within the size range, which
+    keeps the candidate set small even when common trigrams ("  l", "ing")
+    appear in thousands of goals. Candidates are then checked exactly.
+    """
+    grams = trigrams(goal_signature(goal_text))
+    if not grams:
+        return None
+
+    size = len(grams)
+    frequency = dict(conn.execute(f'''
+        SELECT trigram, goals FROM goal_trigram_counts
+        WHERE user_id = ? AND trigram IN ({", ".join("?" * size)})
+    ''', (user_id, *grams)).fetchall())
+    probes = sorted(grams, key=lambda gram: frequency.get(gram, 0))[:size - math.ceil(threshold * size) + 1]
+    if not any(frequency.get(gram) for gram in probes):
+        return None
+
+    rows = conn.execute(f'''
+        SELECT g.id, g.goal_text, s.signature
+        FROM goal_signatures s
+        JOIN goals g ON g.id = s.goal_id
+        WHERE s.goal_id IN (
+                SELECT goal_id FROM goal_trigrams
+                WHERE user_id = ? AND trigram IN ({", ".join("?" * len(probes))})
+                    AND size BETWEEN ? AND ?
+            )
+            AND g.status = 'active'
+        ORDER BY g.id
+    ''', (user_id, *probes, math.ceil(threshold * size), math.floor(size / threshold))).fetchall()
+
+    best = None
+    for goal_id, text, signature in rows:
+        other = trigrams(signature)
+        similarity = len(grams & other) / len(grams | other)
+        if similarity >= threshold and (best is None or similarity > best[2]):
+            best = (goal_id, text, similarity)
+    return best
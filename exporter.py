@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+AURA Export
+Streams goals, moods, progress and reminders out of aura_memory.db as JSONL
+or CSV, optionally gzipped, in constant memory.
+
+Usage:
+    python exporter.py moods
+    python exporter.py progress --format csv --gzip --start 2024-01-01 -o progress.csv.gz
+    python exporter.py moods --archived --user default
+
+Author: Mark Mikile Mutunga
+Copyright (c) 2025 Mark Mikile Mutunga. All rights reserved.
+
+This software is licensed under the MIT License.
+See the LICENSE file for full license text.
+"""
+
+import argparse
+import csv
+import io
+import json
+import sqlite3
+import sys
+import zlib
+
+from importer import parse_timestamp
+from retention import ARCHIVE_TABLES, archived_rows
+
+# Exportable tables: (epoch column used for date filters, exported columns)
+EXPORT_TABLES = {
+    'goals': ('added_ts', ['id', 'user_id', 'goal_text', 'date_added', 'status']),
+    'moods': ('logged_ts', ['id', 'user_id', 'mood', 'description', 'date_logged']),
+    'progress': ('created_ts', ['id', 'user_id', 'goal_id', 'status', 'created_at']),
+    'reminders': ('created_ts', ['id', 'user_id', 'goal_id', 'message', 'created_at', 'is_read']),
+}
+
+CONTENT_TYPES = {'jsonl': 'application/x-ndjson', 'csv': 'text/csv'}
+
+
+def iter_rows(db_name, table, start=None, end=None, user_id=None, chunk_size=1000, archived=False):
+    """
+    Yield rows of a table as dicts, oldest first.
+
+    Uses its own read-only connection and steps the cursor chunk_size rows at
+    a time, so memory stays flat and (in WAL mode) writers are never blocked.
+    start/end are epoch seconds; end is exclusive. user_id limits the
+    export to one user's rows. archived=True first yields the rows
+    retention.py moved into the archive.
+    """
+    ts_column, columns = EXPORT_TABLES[table]
+    where, params = [], []
+    if user_id is not None:
+        where.append('user_id = ?')
+        params.append(user_id)
+    if start is not None:
+        where.append(f'{ts_column} >= ?')
+        params.append(start)
+    if end is not None:
+        where.append(f'{ts_column} < ?')
+        params.append(end)
+
+    sql = f'SELECT {", ".join(columns)} FROM {table}'
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    sql += ' ORDER BY id'
+
+    conn = sqlite3.connect(f'file:{db_name}?mode=ro', uri=True, check_same_thread=False)
+    try:
+        if archived and table in ARCHIVE_TABLES:
+            yield from archived_rows(conn, table, user_id, start, end, columns)
+
+        cursor = conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(zip(columns, row))
+    finally:
+        conn.close()
+
+
+def encode_rows(rows, columns, fmt):
+    """Turn row dicts into text chunks: one JSON object per line, or CSV with a header."""
+    if fmt == 'jsonl':
+        for row in rows:
+            yield json.dumps(row, ensure_ascii=False) + '\n'
+        return
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= 64 * 1024:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def gzip_chunks(chunks):
+    """Gzip a stream of text chunks incrementally, yielding bytes."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(db_name, table, fmt='jsonl', compress=False, start=None, end=None, user_id=None,
+                  archived=False):
+    """Return a generator of str (or bytes, when compressed) chunks for a table export."""
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown table {table!r}")
+    if fmt not in CONTENT_TYPES:
+        raise ValueError(f"Unknown format {fmt!r}")
+
+    rows = iter_rows(db_name, table, start, end, user_id, archived=archived)
+    chunks = encode_rows(rows, EXPORT_TABLES[table][1], fmt)
+    return gzip_chunks(chunks) if compress else chunks
+
+
+def parse_bound(value):
+    """Parse a --start/--end date (or ISO datetime) into epoch seconds. Raises ValueError."""
+    if not value:
+        return None
+    try:
+        return int(parse_timestamp(value).timestamp())
+    except (OverflowError, OSError):
+        raise ValueError(f"Date out of range: {value!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export AURA data as JSONL or CSV")
+    parser.add_argument('table', choices=sorted(EXPORT_TABLES))
+    parser.add_argument('--format', choices=sorted(CONTENT_TYPES), default='jsonl')
+    parser.add_argument('--gzip', action='store_true', help="Gzip the output")
+    parser.add_argument('--start', help="Only rows on/after this date (YYYY-MM-DD or ISO datetime)")
+    parser.add_argument('--end', help="Only rows before this date")
+    parser.add_argument('--user', help="Only this user's rows (default: all users)")
+    parser.add_argument('--archived', action='store_true', help="Include rows archived by retention.py")
+    parser.add_argument('-o', '--output', help="Output file (default: stdout)")
+    parser.add_argument('--db', default='aura_memory.db', help="Database file")
+    args = parser.parse_args()
+
+    try:
+        start, end = parse_bound(args.start), parse_bound(args.end)
+    except ValueError as e:
+        parser.error(str(e))
+
+    stream = export_stream(args.db, args.table, args.format, args.gzip,
+                           start, end, args.user, args.archived)
+
+    if args.output:
+        out = open(args.output, 'wb' if args.gzip else 'w', encoding=None if args.gzip else 'utf-8')
+    else:
+        out = sys.stdout.buffer if args.gzip else sys.stdout
+
+    try:
+        for chunk in stream:
+            out.write(chunk)
+    except sqlite3.Error as e:
+        print(f"❌ Export failed: {e}", file=sys.stderr)
+        raise SystemExit(1)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
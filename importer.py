@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+AURA Bulk Import
+Streams historical goals, moods and progress from CSV or JSONL exports into
+aura_memory.db.
+
+Each record is a row/object with an optional "type" column:
+    message   (default) free text; classified with AURA's goal/mood detection
+    goal      "text" is stored as a goal
+    mood      "mood" plus optional "text" as the description
+    progress  "status" (yes/no/maybe) for "goal_id" or a goal's "goal" text
+and an optional "timestamp" (ISO 8601 or epoch seconds, default now).
+
+Usage:
+    python importer.py journal.csv
+    python importer.py export.jsonl.gz --batch-size 20000 --db aura_memory.db
+
+Author: Mark Mikile Mutunga
+Copyright (c) 2025 Mark Mikile Mutunga. All rights reserved.
+
+This software is licensed under the MIT License.
+See the LICENSE file for full license text.
+"""
+
+import argparse
+import csv
+import datetime
+import gzip
+import io
+import json
+import sqlite3
+import time
+
+from aura import AURA, DEFAULT_USER, INSERT_GOAL_SQL, INSERT_MOOD_SQL, INSERT_PROGRESS_SQL, timestamps
+from dedupe import find_duplicate, index_goal
+
+
+def open_text(path):
+    """Open a file for reading text, transparently un-gzipping .gz files."""
+    if path.endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(path, 'rb'), encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def read_records(path, fmt=None):
+    """Yield one dict per record from a CSV or JSONL file, without loading it all."""
+    if fmt is None:
+        name = path[:-3] if path.endswith('.gz') else path
+        fmt = 'csv' if name.endswith('.csv') else 'jsonl'
+
+    with open_text(path) as handle:
+        if fmt == 'csv':
+            yield from csv.DictReader(handle)
+        else:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    yield {}  # Counted as skipped
+
+
+def parse_timestamp(value):
+    """Turn an ISO string or epoch number into a naive local datetime (None -> now)."""
+    if value in (None, ''):
+        return datetime.datetime.now()
+
+    # Out-of-range epochs and dates raise ValueError, so a bad record is skipped
+    try:
+        if isinstance(value, (int, float)):
+            return datetime.datetime.fromtimestamp(value)
+        # Numeric text is epoch seconds only when longer than a compact date ("20250101")
+        whole, _, fraction = str(value).partition('.')
+        if whole.isdigit() and len(whole) > 8 and (not fraction or fraction.isdigit()):
+            return datetime.datetime.fromtimestamp(float(value))
+
+        when = datetime.datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        if when.tzinfo is not None:
+            when = when.astimezone().replace(tzinfo=None)
+        return when
+    except (OverflowError, OSError):
+        raise ValueError(f"Timestamp out of range: {value!r}")
+
+
+class BulkImporter:
+    """
+    Classifies and inserts records in large transactions, as aura.user_id.
+
+    Moods and progress rows are buffered and written with executemany once
+    batch_size rows are pending. Goals are inserted as they arrive so later
+    progress rows in the same file can refer to them by text.
+    """
+
+    def __init__(self, aura, batch_size=5000, report_every=100000):
+        self.aura = aura
+        self.batch_size = batch_size
+        self.report_every = report_every
+        self.goal_ids = {}  # cleaned goal text -> id
+        self.stats = {'records': 0, 'goals': 0, 'moods': 0, 'progress': 0, 'skipped': 0}
+
+    def import_file(self, path, fmt=None):
+        """Import every record in a CSV/JSONL file. Returns the stats dict."""
+        return self.import_records(read_records(path, fmt))
+
+    def import_records(self, records):
+        """Import an iterable of record dicts. Returns the stats dict."""
+        started = time.perf_counter()
+        records = iter(records)
+        more = True
+
+        try:
+            while more:
+                # One transaction per batch of staged mood/progress rows
+                with self.aura.db.transaction() as conn:
+                    more = self._import_batch(conn, records, started)
+        finally:
+            # Imported history may predate existing check-ins, which the
+            # goal_stats trigger can't fold into streaks
+            if self.stats['progress']:
+                self.aura.rebuild_goal_stats()
+            self.aura._data_changed('goals', 'moods', 'progress')
+
+        self.stats['seconds'] = round(time.perf_counter() - started, 3)
+        self.stats['records_per_sec'] = round(self.stats['records'] / max(self.stats['seconds'], 1e-9))
+        return self.stats
+
+    def _import_batch(self, conn, records, started):
+        """Consume records until a batch is full. Returns False once input runs out."""
+        moods, progress = [], []
+
+        for record in records:
+            self.stats['records'] += 1
+            try:
+                self._route(conn, record, moods, progress)
+            except (ValueError, TypeError, KeyError, AttributeError):
+                self.stats['skipped'] += 1
+
+            if self.report_every and self.stats['records'] % self.report_every == 0:
+                self._report(started)
+
+            if len(moods) + len(progress) >= self.batch_size:
+                self._write_batch(conn, moods, progress)
+                return True
+
+        self._write_batch(conn, moods, progress)
+        return False
+
+    def _route(self, conn, record, moods, progress):
+        """Classify one record and stage its row(s)."""
+        kind = (record.get('type') or 'message').strip().lower()
+        text = (record.get('text') or record.get('message') or '').strip()
+        when = timestamps(parse_timestamp(record.get('timestamp') or record.get('date')))
+
+        if kind == 'message':
+            if not text:
+                raise ValueError("empty message")
+            if self.aura.detect_goal(text):
+                kind = 'goal'
+            else:
+                mood = self.aura.classify_mood(text)
+                if mood is None:
+                    raise ValueError("no goal or mood in message")
+                moods.append((self.aura.user_id, mood, text, *when))
+                return
+
+        if kind == 'goal':
+            self._goal_id(conn, text, when, create=True)
+        elif kind == 'mood':
+            moods.append((self.aura.user_id, record['mood'].strip().lower(), text, *when))
+        elif kind == 'progress':
+            status = record['status'].strip().lower()
+            if status not in ('yes', 'no', 'maybe'):
+                raise ValueError(f"unknown progress status {status!r}")
+            goal_id = record.get('goal_id')
+            if goal_id in (None, ''):
+                goal_id = self._goal_id(conn, record['goal'], when, create=False)
+            progress.append((self.aura.user_id, int(goal_id), status, *when))
+        else:
+            raise ValueError(f"unknown record type {kind!r}")
+
+    def _goal_id(self, conn, goal_text, when, create):
+        """
+        Look up (or insert) a goal by its cleaned text and return its id.
+        Near-duplicates of an active goal resolve to that goal.
+        """
+        clean_goal = self.aura.clean_goal_text(goal_text)
+        if not clean_goal:
+            raise ValueError("empty goal")
+
+        if clean_goal not in self.goal_ids:
+            row = conn.execute(
+                'SELECT id FROM goals WHERE user_id = ? AND goal_text = ?',
+                (self.aura.user_id, clean_goal)
+            ).fetchone() or find_duplicate(conn, self.aura.user_id, clean_goal)
+            if row is not None:
+                self.goal_ids[clean_goal] = row[0]
+            elif create:
+                cursor = conn.execute(INSERT_GOAL_SQL, (self.aura.user_id, clean_goal, *when))
+                index_goal(conn, cursor.lastrowid, self.aura.user_id, clean_goal)
+                self.goal_ids[clean_goal] = cursor.lastrowid
+                self.stats['goals'] += 1
+            else:
+                raise KeyError(clean_goal)
+
+        return self.goal_ids[clean_goal]
+
+    def _write_batch(self, conn, moods, progress):
+        """executemany the staged rows on the open transaction and clear them."""
+        if moods:
+            conn.executemany(INSERT_MOOD_SQL, moods)
+            self.stats['moods'] += len(moods)
+            moods.clear()
+        if progress:
+            conn.executemany(INSERT_PROGRESS_SQL, progress)
+            self.stats['progress'] += len(progress)
+            progress.clear()
+
+    def _report(self, started):
+        """Print a progress line with the running throughput."""
+        elapsed = time.perf_counter() - started
+        print(f"⏳ {self.stats['records']:,} records "
+              f"({self.stats['records'] / elapsed:,.0f}/s) - "
+              f"{self.stats['goals']:,} goals, {self.stats['moods']:,} moods, "
+              f"{self.stats['progress']:,} progress, {self.stats['skipped']:,} skipped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import goals, moods and progress into AURA")
+    parser.add_argument('path', help="CSV or JSONL file (optionally .gz)")
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help="Override format detection")
+    parser.add_argument('--batch-size', type=int, default=5000, help="Rows per transaction")
+    parser.add_argument('--db', default='aura_memory.db', help="Database file")
+    parser.add_argument('--user', default=DEFAULT_USER, help="User the records belong to")
+    args = parser.parse_args()
+
+    aura = AURA(db_name=args.db, user_id=args.user)
+    try:
+        stats = BulkImporter(aura, batch_size=args.batch_size).import_file(args.path, args.format)
+    except (OSError, sqlite3.Error) as e:
+        print(f"❌ Import failed: {e}")
+        raise SystemExit(1)
+    finally:
+        aura.close()
+
+    print(f"✅ Imported {stats['records']:,} records in {stats['seconds']}s "
+          f"({stats['records_per_sec']:,} records/s)")
+    print(f"   🎯 {stats['goals']:,} goals, 💭 {stats['moods']:,} moods, "
+          f"📈 {stats['progress']:,} progress, ⏭️  {stats['skipped']:,} skipped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+AURA Metrics
+Lightweight, thread-safe histograms and gauges for instrumenting hot paths,
+rendered in the Prometheus text format for a /metrics endpoint.
+
+Metrics live in the process that records them; with several worker
+processes, scrape each one (or aggregate in Prometheus).
+
+Author: Mark Mikile Mutunga
+Copyright (c) 2025 Mark Mikile Mutunga. All rights reserved.
+
+This software is licensed under the MIT License.
+See the LICENSE file for full license text.
+"""
+
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the latency buckets, Prometheus style
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+# Every metric created, in creation order, for render()
+REGISTRY = []
+
+
+def _escape(value):
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    """Render a Prometheus label set like {route="/chat",le="0.5"}."""
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class Histogram:
+    """
+    Counts observations into fixed buckets, per combination of label values.
+
+    Recording is a bisect and three additions under a lock, cheap enough
+    for every request. Percentiles are estimated from the buckets, so they
+    are as precise as the bucket bounds.
+    """
+
+    def __init__(self, name, description, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [per-bucket counts (+inf last), sum, count]
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value, *label_values):
+        """Record one observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, *label_values):
+        """Observe how long the with-block takes, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def percentile(self, pct, *label_values):
+        """Upper bound of the bucket holding the pct-th percentile (None if no data)."""
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None or not series[2]:
+                return None
+            counts, _, total = list(series[0]), series[1], series[2]
+
+        rank = pct / 100 * total
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def summary(self):
+        """{label values: {'count', 'mean', 'p50', 'p99'}} for every series."""
+        with self._lock:
+            keys = [(key, series[1], series[2]) for key, series in self._series.items()]
+        return {
+            key: {
+                'count': count,
+                'mean': total / count if count else 0.0,
+                'p50': self.percentile(50, *key),
+                'p99': self.percentile(99, *key),
+            }
+            for key, total, count in keys
+        }
+
+    def timed(self, func):
+        """Decorator: observe each call's duration, labelled with the function's name."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.time(func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def render(self):
+        """Prometheus text exposition lines for this histogram."""
+        with self._lock:
+            series = [(key, list(counts), total, count) for key, (counts, total, count) in self._series.items()]
+
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for key, counts, total, count in sorted(series):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, [('le', le)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class Gauge:
+    """
+    A value read at scrape time from a callback, so nothing is recorded on
+    the hot path. The callback returns a number, or a {label values: number}
+    dict when the gauge has labels.
+    """
+
+    def __init__(self, name, description, callback, labels=(), kind='gauge'):
+        self.name = name
+        self.description = description
+        self.callback = callback
+        self.labels = tuple(labels)
+        self.kind = kind  # 'counter' for callbacks returning running totals
+        REGISTRY.append(self)
+
+    def render(self):
+        """Prometheus text exposition lines for this gauge."""
+        try:
+            value = self.callback()
+        except Exception as e:
+            print(f"❌ Error reading metric {self.name}: {e}")
+            return []
+
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        values = value.items() if isinstance(value, dict) else [((), value)]
+        for key, number in sorted(values):
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {number}")
+        return lines
+
+
+def render():
+    """Every registered metric in the Prometheus text format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Time to build a chat reply, split by whether the greeting was included
+CHAT_LATENCY = Histogram('aura_chat_reply_seconds', "Time to build a /chat reply", labels=('kind',))
+
+# Time spent serving each route (method, route pattern, status code)
+REQUEST_LATENCY = Histogram('aura_http_request_seconds', "Time to serve an HTTP request",
+                            labels=('method', 'route', 'status'))
+
+# Time spent in each AURA data method, including waiting for a connection
+QUERY_LATENCY = Histogram('aura_db_query_seconds', "Time spent in an AURA data method", labels=('method',))
+
+# Duration of each scheduled job run
+JOB_DURATION = Histogram('aura_scheduler_job_seconds', "Duration of a scheduled job run", labels=('job',))
@@ -0,0 +1,695 @@
+#!/usr/bin/env python3
+"""
+AURA Schema Migrations
+Versioned, forward-only changes to the aura_memory.db schema.
+
+The applied version is kept in SQLite's PRAGMA user_version. Each migration
+runs in its own write transaction, so two processes starting at once can't
+apply the same step twice.
+
+Author: Mark Mikile Mutunga
+Copyright (c) 2025 Mark Mikile Mutunga. All rights reserved.
+
+This software is licensed under the MIT License.
+See the LICENSE file for full license text.
+"""
+
+import sqlite3
+
+from dedupe import index_goal
+
+
+def _v1_core_tables(conn):
+    """Create the original goals, moods, progress and reminders tables."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS goals (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            goal_text TEXT NOT NULL,
+            date_added TEXT NOT NULL,
+            status TEXT DEFAULT 'active'
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS moods (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mood TEXT NOT NULL,
+            description TEXT,
+            date_logged TEXT NOT NULL
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS progress (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            goal_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY (goal_id) REFERENCES goals (id)
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS reminders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            goal_id INTEGER NOT NULL,
+            message TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            is_read INTEGER DEFAULT 0,
+            FOREIGN KEY (goal_id) REFERENCES goals (id)
+        )
+    ''')
+
+
+def _v2_numeric_timestamps(conn):
+    """
+    Add epoch-second timestamp columns next to the ISO text ones.
+
+    The text columns hold local time from datetime.now().isoformat(), so the
+    backfill converts them with the 'utc' modifier.
+    """
+    for table, text_column, ts_column in (
+        ('goals', 'date_added', 'added_ts'),
+        ('moods', 'date_logged', 'logged_ts'),
+        ('progress', 'created_at', 'created_ts'),
+        ('reminders', 'created_at', 'created_ts'),
+    ):
+        conn.execute(f'ALTER TABLE {table} ADD COLUMN {ts_column} INTEGER')
+        conn.execute(f'''
+            UPDATE {table}
+            SET {ts_column} = CAST(strftime('%s', {text_column}, 'utc') AS INTEGER)
+        ''')
+
+
+def _v3_query_indexes(conn):
+    """Add covering indexes for the goal list, analytics and reminder queries."""
+    # get_goals / get_goals_with_ids: WHERE status = 'active' ORDER BY added_ts
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_goals_status_added ON goals (status, added_ts)')
+
+    # get_mood_analytics: counts by mood, and recent trends by day and mood
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_moods_mood ON moods (mood)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_moods_logged ON moods (logged_ts, mood)')
+
+    # get_goal_progress_analytics: per-goal join, and recent trends by day
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_progress_goal ON progress (goal_id, status)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_progress_created ON progress (created_ts, status)')
+
+    # get_unread_reminders: only unread rows are ever looked up
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_reminders_unread
+        ON reminders (created_ts) WHERE is_read = 0
+    ''')
+
+
+def _v4_daily_rollups(conn):
+    """
+    Add per-day mood and progress rollup tables kept current by triggers.
+
+    The dashboard reads these instead of grouping the raw tables, so its
+    cost follows the number of days shown rather than rows logged. Days come
+    from the local-time ISO text columns, matching what the user saw.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS mood_daily (
+            day TEXT NOT NULL,
+            mood TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, mood)
+        ) WITHOUT ROWID
+    ''')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS progress_daily (
+            day TEXT PRIMARY KEY,
+            yes_count INTEGER NOT NULL DEFAULT 0,
+            no_count INTEGER NOT NULL DEFAULT 0,
+            maybe_count INTEGER NOT NULL DEFAULT 0,
+            total INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_moods_daily
+        AFTER INSERT ON moods
+        BEGIN
+            INSERT INTO mood_daily (day, mood, count)
+            VALUES (DATE(NEW.date_logged), NEW.mood, 1)
+            ON CONFLICT (day, mood) DO UPDATE SET count = count + 1;
+        END
+    ''')
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_progress_daily
+        AFTER INSERT ON progress
+        BEGIN
+            INSERT INTO progress_daily (day, yes_count, no_count, maybe_count, total)
+            VALUES (
+                DATE(NEW.created_at),
+                NEW.status = 'yes',
+                NEW.status = 'no',
+                NEW.status = 'maybe',
+                1
+            )
+            ON CONFLICT (day) DO UPDATE SET
+                yes_count = yes_count + excluded.yes_count,
+                no_count = no_count + excluded.no_count,
+                maybe_count = maybe_count + excluded.maybe_count,
+                total = total + 1;
+        END
+    ''')
+
+    # Backfill from existing rows
+    conn.execute('DELETE FROM mood_daily')
+    conn.execute('''
+        INSERT INTO mood_daily (day, mood, count)
+        SELECT DATE(date_logged), mood, COUNT(*)
+        FROM moods
+        GROUP BY DATE(date_logged), mood
+    ''')
+
+    conn.execute('DELETE FROM progress_daily')
+    conn.execute('''
+        INSERT INTO progress_daily (day, yes_count, no_count, maybe_count, total)
+        SELECT
+            DATE(created_at),
+            SUM(status = 'yes'),
+            SUM(status = 'no'),
+            SUM(status = 'maybe'),
+            COUNT(*)
+        FROM progress
+        GROUP BY DATE(created_at)
+    ''')
+
+
+def _v5_user_partitioning(conn):
+    """
+    Add a user_id to every table and re-key indexes and rollups by user.
+
+    Existing rows belong to the 'default' user, which is also who the
+    terminal app and a single-user web app run as.
+    """
+    for table in ('goals', 'moods', 'progress', 'reminders'):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN user_id TEXT NOT NULL DEFAULT 'default'")
+
+    # Replace the global indexes with per-user ones
+    for index in ('idx_goals_status_added', 'idx_moods_mood', 'idx_moods_logged',
+                  'idx_progress_created', 'idx_reminders_unread'):
+        conn.execute(f'DROP INDEX IF EXISTS {index}')
+
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_goals_user_status ON goals (user_id, status, added_ts)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_moods_user_logged ON moods (user_id, logged_ts)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_progress_user_created ON progress (user_id, created_ts)')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_reminders_user_unread
+        ON reminders (user_id, created_ts) WHERE is_read = 0
+    ''')
+
+    # Rebuild the rollups with user_id leading the primary key
+    conn.execute('DROP TRIGGER IF EXISTS trg_moods_daily')
+    conn.execute('DROP TRIGGER IF EXISTS trg_progress_daily')
+    conn.execute('DROP TABLE IF EXISTS mood_daily')
+    conn.execute('DROP TABLE IF EXISTS progress_daily')
+
+    conn.execute('''
+        CREATE TABLE mood_daily (
+            user_id TEXT NOT NULL,
+            day TEXT NOT NULL,
+            mood TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, day, mood)
+        ) WITHOUT ROWID
+    ''')
+
+    conn.execute('''
+        CREATE TABLE progress_daily (
+            user_id TEXT NOT NULL,
+            day TEXT NOT NULL,
+            yes_count INTEGER NOT NULL DEFAULT 0,
+            no_count INTEGER NOT NULL DEFAULT 0,
+            maybe_count INTEGER NOT NULL DEFAULT 0,
+            total INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, day)
+        ) WITHOUT ROWID
+    ''')
+
+    conn.execute('''
+        CREATE TRIGGER trg_moods_daily
+        AFTER INSERT ON moods
+        BEGIN
+            INSERT INTO mood_daily (user_id, day, mood, count)
+            VALUES (NEW.user_id, DATE(NEW.date_logged), NEW.mood, 1)
+            ON CONFLICT (user_id, day, mood) DO UPDATE SET count = count + 1;
+        END
+    ''')
+
+    conn.execute('''
+        CREATE TRIGGER trg_progress_daily
+        AFTER INSERT ON progress
+        BEGIN
+            INSERT INTO progress_daily (user_id, day, yes_count, no_count, maybe_count, total)
+            VALUES (
+                NEW.user_id,
+                DATE(NEW.created_at),
+                NEW.status = 'yes',
+                NEW.status = 'no',
+                NEW.status = 'maybe',
+                1
+            )
+            ON CONFLICT (user_id, day) DO UPDATE SET
+                yes_count = yes_count + excluded.yes_count,
+                no_count = no_count + excluded.no_count,
+                maybe_count = maybe_count + excluded.maybe_count,
+                total = total + 1;
+        END
+    ''')
+
+    conn.execute('''
+        INSERT INTO mood_daily (user_id, day, mood, count)
+        SELECT user_id, DATE(date_logged), mood, COUNT(*)
+        FROM moods
+        GROUP BY user_id, DATE(date_logged), mood
+    ''')
+
+    conn.execute('''
+        INSERT INTO progress_daily (user_id, day, yes_count, no_count, maybe_count, total)
+        SELECT
+            user_id,
+            DATE(created_at),
+            SUM(status = 'yes'),
+            SUM(status = 'no'),
+            SUM(status = 'maybe'),
+            COUNT(*)
+        FROM progress
+        GROUP BY user_id, DATE(created_at)
+    ''')
+
+
+def _v6_reminder_delivery(conn):
+    """
+    Record when each reminder was delivered.
+
+    Reminders already marked read get their creation time, the best
+    estimate available.
+    """
+    conn.execute('ALTER TABLE reminders ADD COLUMN delivered_at TEXT')
+    conn.execute('ALTER TABLE reminders ADD COLUMN delivered_ts INTEGER')
+    conn.execute('''
+        UPDATE reminders SET delivered_at = created_at, delivered_ts = created_ts
+        WHERE is_read = 1
+    ''')
+
+
+def _v7_reminder_schedules(conn):
+    """
+    Give every goal its own reminder schedule, keyed for due-time lookups.
+
+    The scheduler job reads only rows with next_due_ts <= now through
+    idx_schedules_due, so its cost follows due reminders, not goal count.
+    New goals get a schedule from a trigger, whichever path inserts them.
+    Existing active goals are spread over the first day so they don't all
+    come due at once.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS reminder_schedules (
+            goal_id INTEGER PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            interval_seconds INTEGER NOT NULL DEFAULT 86400,
+            next_due_ts INTEGER NOT NULL,
+            last_sent_ts INTEGER
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_schedules_due ON reminder_schedules (next_due_ts)')
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_goals_schedule
+        AFTER INSERT ON goals
+        BEGIN
+            INSERT OR IGNORE INTO reminder_schedules (goal_id, user_id, next_due_ts)
+            VALUES (
+                NEW.id,
+                NEW.user_id,
+                MAX(NEW.added_ts, CAST(strftime('%s', 'now') AS INTEGER)) + 86400
+            );
+        END
+    ''')
+
+    conn.execute('''
+        INSERT OR IGNORE INTO reminder_schedules (goal_id, user_id, next_due_ts)
+        SELECT id, user_id, CAST(strftime('%s', 'now') AS INTEGER) + ABS(RANDOM() % 86400)
+        FROM goals
+        WHERE status = 'active'
+    ''')
+
+
+def _v8_scheduler_leases(conn):
+    """
+    Add a lease table so only one process runs each scheduled job.
+
+    A lease is held until expires_ts (epoch seconds) and renewed by its
+    owner on every run; another process may take it once it expires.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS scheduler_leases (
+            name TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_ts REAL NOT NULL
+        )
+    ''')
+
+
+def _v9_reminder_history_index(conn):
+    """Index every reminder by user and time, for paging through reminder history."""
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_reminders_user_created ON reminders (user_id, created_ts)')
+
+
+def rebuild_goal_stats(conn, user_id=None):
+    """
+    Recompute goal_stats from the progress table, for one user or everyone.
+
+    The trigger assumes check-ins arrive in time order; run this after
+    backfilling older history so the streaks are exact again.
+    """
+    where, params = ('WHERE user_id = ?', (user_id,)) if user_id is not None else ('', ())
+    conn.execute(f'DELETE FROM goal_stats {where}', params)
+
+    # created_at comes from the row with the latest created_ts (SQLite's bare-column MAX rule)
+    conn.execute(f'''
+        INSERT INTO goal_stats (
+            goal_id, user_id, yes_count, no_count, maybe_count, total, last_check_in, last_check_in_ts
+        )
+        SELECT goal_id, user_id, SUM(status = 'yes'), SUM(status = 'no'), SUM(status = 'maybe'),
+               COUNT(*), created_at, MAX(created_ts)
+        FROM progress
+        {where}
+        GROUP BY goal_id
+    ''', params)
+
+    # Streaks are runs of consecutive days with a 'yes': days minus their rank
+    # is constant within a run
+    conn.execute(f'''
+        WITH yes_days AS (
+            SELECT DISTINCT goal_id, DATE(created_at) AS day
+            FROM progress
+            {where} {'AND' if where else 'WHERE'} status = 'yes'
+        ),
+        runs AS (
+            SELECT goal_id, COUNT(*) AS length, MAX(day) AS last_day
+            FROM (
+                SELECT goal_id, day,
+                       julianday(day) - ROW_NUMBER() OVER (PARTITION BY goal_id ORDER BY day) AS run
+                FROM yes_days
+            )
+            GROUP BY goal_id, run
+        ),
+        ranked AS (
+            SELECT goal_id, length, last_day,
+                   MAX(length) OVER (PARTITION BY goal_id) AS longest,
+                   ROW_NUMBER() OVER (PARTITION BY goal_id ORDER BY last_day DESC) AS recency
+            FROM runs
+        )
+        UPDATE goal_stats
+        SET current_streak = ranked.length,
+            longest_streak = ranked.longest,
+            last_yes_day = ranked.last_day
+        FROM ranked
+        WHERE goal_stats.goal_id = ranked.goal_id AND ranked.recency = 1
+    ''', params)
+
+
+def _v10_goal_stats(conn):
+    """
+    Keep per-goal check-in counters and streaks, so goal analytics are
+    lookups instead of a scan of the whole progress table.
+
+    A trigger updates a goal's row on every progress insert. current_streak
+    is the run of consecutive 'yes' days ending on last_yes_day; readers
+    treat it as broken once last_yes_day is before yesterday.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS goal_stats (
+            goal_id INTEGER PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            yes_count INTEGER NOT NULL DEFAULT 0,
+            no_count INTEGER NOT NULL DEFAULT 0,
+            maybe_count INTEGER NOT NULL DEFAULT 0,
+            total INTEGER NOT NULL DEFAULT 0,
+            current_streak INTEGER NOT NULL DEFAULT 0,
+            longest_streak INTEGER NOT NULL DEFAULT 0,
+            last_yes_day TEXT,
+            last_check_in TEXT,
+            last_check_in_ts INTEGER
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_progress_goal_stats
+        AFTER INSERT ON progress
+        BEGIN
+            INSERT INTO goal_stats (
+                goal_id, user_id, yes_count, no_count, maybe_count, total,
+                current_streak, longest_streak, last_yes_day, last_check_in, last_check_in_ts
+            )
+            VALUES (
+                NEW.goal_id,
+                NEW.user_id,
+                NEW.status = 'yes',
+                NEW.status = 'no',
+                NEW.status = 'maybe',
+                1,
+                NEW.status = 'yes',
+                NEW.status = 'yes',
+                CASE WHEN NEW.status = 'yes' THEN DATE(NEW.created_at) END,
+                NEW.created_at,
+                NEW.created_ts
+            )
+            ON CONFLICT (goal_id) DO UPDATE SET
+                yes_count = yes_count + excluded.yes_count,
+                no_count = no_count + excluded.no_count,
+                maybe_count = maybe_count + excluded.maybe_count,
+                total = total + 1,
+                current_streak = CASE
+                    WHEN excluded.last_yes_day IS NULL THEN current_streak
+                    WHEN last_yes_day IS NULL OR excluded.last_yes_day > DATE(last_yes_day, '+1 day') THEN 1
+                    WHEN excluded.last_yes_day = DATE(last_yes_day, '+1 day') THEN current_streak + 1
+                    ELSE current_streak
+                END,
+                last_yes_day = CASE
+                    WHEN excluded.last_yes_day > COALESCE(last_yes_day, '') THEN excluded.last_yes_day
+                    ELSE last_yes_day
+                END,
+                last_check_in = CASE
+                    WHEN excluded.last_check_in_ts >= COALESCE(last_check_in_ts, 0) THEN excluded.last_check_in
+                    ELSE last_check_in
+                END,
+                last_check_in_ts = MAX(COALESCE(last_check_in_ts, 0), excluded.last_check_in_ts);
+
+            UPDATE goal_stats SET longest_streak = current_streak
+            WHERE goal_id = NEW.goal_id AND current_streak > longest_streak;
+        END
+    ''')
+
+    rebuild_goal_stats(conn)
+
+
+def fts5_available(conn):
+    """Whether this SQLite build has the FTS5 full-text search module."""
+    try:
+        conn.execute('CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)')
+        conn.execute('DROP TABLE temp.fts5_probe')
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def _v11_full_text_search(conn):
+    """
+    Index goal texts and mood descriptions for full-text search.
+
+    goals_fts and moods_fts are external-content FTS5 tables: they store
+    only the index and read the text back from goals/moods, kept in sync by
+    insert, update and delete triggers. Prefix indexes on 2 and 3 characters
+    keep prefix queries on short words fast. On SQLite builds without FTS5 this
+    step is a no-op and AURA.search falls back to LIKE scans.
+    """
+    if not fts5_available(conn):
+        print("⚠️  SQLite was built without FTS5; search will use slower LIKE scans")
+        return
+
+    for table, column in (('goals', 'goal_text'), ('moods', 'description')):
+        conn.execute(f'''
+            CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5(
+                {column}, content='{table}', content_rowid='id',
+                tokenize='porter unicode61', prefix='2 3'
+            )
+        ''')
+
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_insert
+            AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO {table}_fts (rowid, {column}) VALUES (NEW.id, NEW.{column});
+            END
+        ''')
+
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_delete
+            AFTER DELETE ON {table}
+            BEGIN
+                INSERT INTO {table}_fts ({table}_fts, rowid, {column}) VALUES ('delete', OLD.id, OLD.{column});
+            END
+        ''')
+
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_update
+            AFTER UPDATE OF {column} ON {table}
+            BEGIN
+                INSERT INTO {table}_fts ({table}_fts, rowid, {column}) VALUES ('delete', OLD.id, OLD.{column});
+                INSERT INTO {table}_fts (rowid, {column}) VALUES (NEW.id, NEW.{column});
+            END
+        ''')
+
+        # Index everything already in the table
+        conn.execute(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')")
+
+
+def _v12_goal_trigrams(conn):
+    """
+    Index goals by normalized trigrams for near-duplicate detection.
+
+    See dedupe.py. goal_trigrams keys each trigram's postings by goal size,
+    so length filtering happens inside the index, and triggers keep
+    goal_trigram_counts (postings per trigram) current for picking the
+    rarest trigrams to look up. Rows are written by whoever inserts the goal
+    (add_goal, the importer); a trigger removes them when a goal is deleted.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS goal_signatures (
+            goal_id INTEGER PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            signature TEXT NOT NULL
+        )
+    ''')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS goal_trigrams (
+            user_id TEXT NOT NULL,
+            trigram TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            goal_id INTEGER NOT NULL,
+            PRIMARY KEY (user_id, trigram, size, goal_id)
+        ) WITHOUT ROWID
+    ''')
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS goal_trigram_counts (
+            user_id TEXT NOT NULL,
+            trigram TEXT NOT NULL,
+            goals INTEGER NOT NULL,
+            PRIMARY KEY (user_id, trigram)
+        ) WITHOUT ROWID
+    ''')
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_goal_trigrams_insert
+        AFTER INSERT ON goal_trigrams
+        BEGIN
+            INSERT INTO goal_trigram_counts (user_id, trigram, goals)
+            VALUES (NEW.user_id, NEW.trigram, 1)
+            ON CONFLICT (user_id, trigram) DO UPDATE SET goals = goals + 1;
+        END
+    ''')
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_goal_trigrams_delete
+        AFTER DELETE ON goal_trigrams
+        BEGIN
+            UPDATE goal_trigram_counts SET goals = goals - 1
+            WHERE user_id = OLD.user_id AND trigram = OLD.trigram;
+        END
+    ''')
+
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_goals_trigrams_delete
+        AFTER DELETE ON goals
+        BEGIN
+            DELETE FROM goal_trigrams WHERE user_id = OLD.user_id AND goal_id = OLD.id;
+            DELETE FROM goal_signatures WHERE goal_id = OLD.id;
+        END
+    ''')
+
+    for goal_id, user_id, goal_text in conn.execute('SELECT id, user_id, goal_text FROM goals').fetchall():
+        index_goal(conn, goal_id, user_id, goal_text)
+
+
+def _v13_archive_chunks(conn):
+    """
+    Hold rows moved out of the hot tables by retention.py, compressed in
+    chunks of one user's rows, indexed for time-range lookups.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS archive_chunks (
+            id INTEGER PRIMARY KEY,
+            table_name TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            first_ts INTEGER NOT NULL,
+            last_ts INTEGER NOT NULL,
+            row_count INTEGER NOT NULL,
+            columns TEXT NOT NULL,
+            data BLOB NOT NULL,
+            archived_ts INTEGER NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_archive_chunks_user
+        ON archive_chunks (table_name, user_id, last_ts)
+    ''')
+
+
+# (version, description, function) in the order they must be applied
+MIGRATIONS = [
+    (1, "Create core tables", _v1_core_tables),
+    (2, "Add numeric timestamp columns", _v2_numeric_timestamps),
+    (3, "Add analytics and reminder indexes", _v3_query_indexes),
+    (4, "Add daily mood and progress rollups", _v4_daily_rollups),
+    (5, "Partition data and indexes by user", _v5_user_partitioning),
+    (6, "Track reminder delivery time", _v6_reminder_delivery),
+    (7, "Add per-goal reminder schedules", _v7_reminder_schedules),
+    (8, "Add scheduler leases", _v8_scheduler_leases),
+    (9, "Index reminder history by user", _v9_reminder_history_index),
+    (10, "Add per-goal check-in stats", _v10_goal_stats),
+    (11, "Add full-text search indexes", _v11_full_text_search),
+    (12, "Index goals for near-duplicate detection", _v12_goal_trigrams),
+    (13, "Add compressed archive chunks", _v13_archive_chunks),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """Return the schema version recorded in the database."""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn):
+    """
+    Apply every pending migration on an autocommit connection.
+    Returns the schema version the database ends up at.
+    """
+    for version, description, apply in MIGRATIONS:
+        if get_schema_version(conn) >= version:
+            continue
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Another process may have migrated while we waited for the lock
+            if get_schema_version(conn) < version:
+                print(f"🛠️  Applying schema migration {version}: {description}")
+                apply(conn)
+                conn.execute(f'PRAGMA user_version = {version}')
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+
+    return get_schema_version(conn)
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+AURA Retention
+Keeps the hot tables small: moves old moods (and optionally progress) into
+compressed archive chunks, deletes delivered reminders past a horizon, and
+returns freed pages to the filesystem with incremental VACUUM.
+
+Archived rows stay queryable through archived_rows() and
+`python exporter.py <table> --archived`. The daily rollups and goal_stats
+are built on insert, so dashboards and long-range statistics keep counting
+archived history.
+
+Policies map a table to the days of history kept hot, e.g.
+"moods=365,reminders=30". Progress isn't archived by default: a later
+goal_stats rebuild (after an import) only sees rows still in the table.
+
+Usage:
+    python retention.py
+    python retention.py --policy moods=180,progress=730,reminders=7
+    python retention.py --full-vacuum    # one-off: enable incremental vacuum on an older database
+
+Author: Mark Mikile Mutunga
+Copyright (c) 2025 Mark Mikile Mutunga. All rights reserved.
+
+This software is licensed under the MIT License.
+See the LICENSE file for full license text.
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+import zlib
+
+# Tables that can be archived: (epoch column, columns kept in the archive)
+ARCHIVE_TABLES = {
+    'moods': ('logged_ts', ['id', 'mood', 'description', 'date_logged', 'logged_ts']),
+    'progress': ('created_ts', ['id', 'goal_id', 'status', 'created_at', 'created_ts']),
+}
+
+# Days of history kept in the hot tables; None keeps everything
+DEFAULT_POLICY = {'moods': 365, 'progress': None, 'reminders': 30}
+
+# Rows per archive chunk (and per delete batch), each in its own short transaction
+CHUNK_SIZE = 5000
+
+# Most free pages handed back per run, so the write lock is held briefly
+VACUUM_PAGES = 2000
+
+# Seconds between runs of the embedded retention job
+RETENTION_INTERVAL = 60 * 60
+
+
+def parse_policy(text):
+    """
+    Parse "moods=365,reminders=30" into a policy dict over DEFAULT_POLICY.
+    "1" (or an empty string) means the defaults; a value of 0 or "none"
+    keeps that table's history. Raises ValueError.
+    """
+    policy = dict(DEFAULT_POLICY)
+    if text.strip() in ('', '1'):
+        return policy
+
+    for item in text.split(','):
+        table, _, days = item.partition('=')
+        table, days = table.strip(), days.strip().lower()
+        if table not in DEFAULT_POLICY:
+            raise ValueError(f"Unknown retention table {table!r}")
+        policy[table] = None if days in ('0', 'none') else int(days)
+        if policy[table] is not None and policy[table] < 0:
+            raise ValueError(f"Negative retention for {table!r}")
+    return policy
+
+
+def user_ids(conn, table):
+    """Distinct user_ids in a table, read as a loose scan of its (user_id, ...) index."""
+    return [row[0] for row in conn.execute(f'''
+        WITH RECURSIVE users (user_id) AS (
+            SELECT MIN(user_id) FROM {table}
+            UNION ALL
+            SELECT (SELECT MIN(user_id) FROM {table} WHERE user_id > users.user_id)
+            FROM users
+            WHERE users.user_id IS NOT NULL
+        )
+        SELECT user_id FROM users WHERE user_id IS NOT NULL
+    ''')]
+
+
+def archive_table(manager, table, cutoff, chunk_size=CHUNK_SIZE):
+    """
+    Move every row older than cutoff (epoch seconds) into archive_chunks,
+    one chunk per user and chunk_size rows. Returns the rows archived.
+    """
+    ts_column, columns = ARCHIVE_TABLES[table]
+    with manager.connection() as conn:
+        users = user_ids(conn, table)
+
+    archived = 0
+    for user_id in users:
+        while True:
+            # Copy and delete in one transaction, so a row is never in both places
+            with manager.transaction(immediate=True) as conn:
+                rows = conn.execute(f'''
+                    SELECT {", ".join(columns)} FROM {table}
+                    WHERE user_id = ? AND {ts_column} < ?
+                    ORDER BY {ts_column}, id
+                    LIMIT ?
+                ''', (user_id, cutoff, chunk_size)).fetchall()
+                if not rows:
+                    break
+
+                ts_index = columns.index(ts_column)
+                conn.execute('''
+                    INSERT INTO archive_chunks
+                        (table_name, user_id, first_ts, last_ts, row_count, columns, data, archived_ts)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    table, user_id, rows[0][ts_index], rows[-1][ts_index], len(rows), json.dumps(columns),
+                    zlib.compress(json.dumps(rows, ensure_ascii=False).encode('utf-8'), 9), int(time.time())
+                ))
+                conn.execute(f'DELETE FROM {table} WHERE id IN ({", ".join("?" * len(rows))})',
+                             [row[0] for row in rows])
+
+            archived += len(rows)
+            if len(rows) < chunk_size:
+                break
+
+    return archived
+
+
+def delete_reminders(manager, cutoff, chunk_size=CHUNK_SIZE):
+    """Delete read reminders created before cutoff (epoch seconds). Unread ones are kept. Returns the count."""
+    with manager.connection() as conn:
+        users = user_ids(conn, 'reminders')
+
+    deleted = 0
+    for user_id in users:
+        while True:
+            with manager.transaction() as conn:
+                cursor = conn.execute('''
+                    DELETE FROM reminders WHERE id IN (
+                        SELECT id FROM reminders
+                        WHERE user_id = ? AND created_ts < ? AND is_read = 1
+                        LIMIT ?
+                    )
+                ''', (user_id, cutoff, chunk_size))
+            deleted += cursor.rowcount
+            if cursor.rowcount < chunk_size:
+                break
+
+    return deleted
+
+
+def incremental_vacuum(manager, max_pages=VACUUM_PAGES):
+    """
+    Return up to max_pages free pages to the filesystem. Returns how many
+    were freed (0 unless the database uses auto_vacuum = INCREMENTAL).
+    """
+    with manager.connection() as conn:
+        if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+            return 0
+        before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        # execute() steps the pragma only once, freeing a single page
+        conn.executescript(f'PRAGMA incremental_vacuum({int(max_pages)})')
+        return before - conn.execute('PRAGMA freelist_count').fetchone()[0]
+
+
+def full_vacuum(db_name):
+    """Switch a database to incremental auto-vacuum and rebuild it (needs exclusive access)."""
+    conn = sqlite3.connect(db_name, isolation_level=None)
+    try:
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM')
+    finally:
+        conn.close()
+
+
+def apply_retention(manager, policy=None, now=None, chunk_size=CHUNK_SIZE):
+    """
+    Apply a retention policy once. Returns {'archived': {table: rows},
+    'deleted_reminders': n, 'freed_pages': n}.
+    """
+    policy = DEFAULT_POLICY if policy is None else policy
+    now = int(now if now is not None else time.time())
+    result = {'archived': {}, 'deleted_reminders': 0, 'freed_pages': 0}
+
+    for table in ARCHIVE_TABLES:
+        if policy.get(table) is not None:
+            result['archived'][table] = archive_table(manager, table, now - policy[table] * 86400, chunk_size)
+    if policy.get('reminders') is not None:
+        result['deleted_reminders'] = delete_reminders(manager, now - policy['reminders'] * 86400, chunk_size)
+
+    result['freed_pages'] = incremental_vacuum(manager)
+    return result
+
+
+def archived_rows(conn, table, user_id=None, start=None, end=None, columns=None):
+    """
+    Yield archived rows of a table as dicts, oldest first per user.
+
+    Only chunks overlapping [start, end) (epoch seconds) are decompressed.
+    Each dict has user_id plus the archived columns, or just `columns`
+    when given (missing ones are None).
+    """
+    ts_column = ARCHIVE_TABLES[table][0]
+    where, params = ['table_name = ?'], [table]
+    if user_id is not None:
+        where.append('user_id = ?')
+        params.append(user_id)
+    if start is not None:
+        where.append('last_ts >= ?')
+        params.append(start)
+    if end is not None:
+        where.append('first_ts < ?')
+        params.append(end)
+
+    chunks = conn.execute(f'''
+        SELECT user_id, columns, data FROM archive_chunks
+        WHERE {" AND ".join(where)}
+        ORDER BY user_id, first_ts, id
+    ''', params)
+
+    for chunk_user, chunk_columns, data in chunks:
+        names = json.loads(chunk_columns)
+        ts_index = names.index(ts_column)
+        for row in json.loads(zlib.decompress(data)):
+            if (start is not None and row[ts_index] < start) or (end is not None and row[ts_index] >= end):
+                continue
+            record = dict(zip(names, row), user_id=chunk_user)
+            yield record if columns is None else {column: record.get(column) for column in columns}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive old AURA rows and compact the database")
+    parser.add_argument('--policy', default='1',
+                        help='Days kept per table, e.g. "moods=365,progress=730,reminders=30" (default: defaults)')
+    parser.add_argument('--full-vacuum', action='store_true',
+                        help="Switch the database to incremental vacuum and rebuild it (stop the app first)")
+    parser.add_argument('--db', default='aura_memory.db', help="Database file")
+    args = parser.parse_args()
+
+    if args.full_vacuum:
+        full_vacuum(args.db)
+        print(f"🧹 Rebuilt {args.db} with incremental vacuum enabled")
+        return
+
+    # Imported here so --full-vacuum doesn't open (and migrate) the database first
+    from aura import AURA
+
+    aura = AURA(db_name=args.db)
+    try:
+        started = time.perf_counter()
+        result = apply_retention(aura.db, parse_policy(args.policy))
+        archived = ', '.join(f"{count:,} {table}" for table, count in result['archived'].items()) or 'nothing'
+        print(f"🗄️  Archived {archived}; deleted {result['deleted_reminders']:,} read reminders; "
+              f"freed {result['freed_pages']:,} pages in {time.perf_counter() - started:.1f}s")
+    finally:
+        aura.close()
+
+
+if __name__ == '__main__':
+    main()
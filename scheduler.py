@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+AURA Scheduler
+Runs the reminder job in exactly one process, however many web workers
+are serving requests.
+
+Every process that wants to run the job must first hold its lease in the
+scheduler_leases table. The web app does this from its embedded scheduler;
+this module can also run as a dedicated scheduler process, in which case the
+web workers are started with AURA_EMBEDDED_SCHEDULER=0.
+
+Usage:
+    python scheduler.py
+    python scheduler.py --interval 30 --db aura_memory.db
+
+Author: Mark Mikile Mutunga
+Copyright (c) 2025 Mark Mikile Mutunga. All rights reserved.
+
+This software is licensed under the MIT License.
+See the LICENSE file for full license text.
+"""
+
+import argparse
+import os
+import socket
+import sqlite3
+import time
+import uuid
+
+from aura import AURA
+
+# Seconds between runs of the reminder job
+JOB_INTERVAL = 60
+
+# A lease outlives a couple of missed runs before another process takes over
+LEASE_TTL = 150
+
+
+class SchedulerLease:
+    """
+    A named, expiring lock stored in the database.
+
+    acquire() takes the lease if it is free or expired, or renews it if this
+    owner already holds it, in a single UPSERT. Works across processes and
+    hosts sharing the database file.
+    """
+
+    def __init__(self, manager, name, ttl=LEASE_TTL, owner=None):
+        self.manager = manager
+        self.name = name
+        self.ttl = ttl
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        # When the lease last taken or renewed here runs out (0 if not held)
+        self.held_until = 0
+
+    def acquire(self):
+        """Take or renew the lease. Returns True if this owner now holds it."""
+        now = time.time()
+        try:
+            with self.manager.transaction() as conn:
+                cursor = conn.execute('''
+                    INSERT INTO scheduler_leases (name, owner, expires_ts)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (name) DO UPDATE SET
+                        owner = excluded.owner,
+                        expires_ts = excluded.expires_ts
+                    WHERE scheduler_leases.owner = excluded.owner
+                        OR scheduler_leases.expires_ts < ?
+                ''', (self.name, self.owner, now + self.ttl, now))
+            self.held_until = now + self.ttl if cursor.rowcount == 1 else 0
+            return cursor.rowcount == 1
+
+        except sqlite3.Error as e:
+            print(f"❌ Error acquiring scheduler lease: {e}")
+            self.held_until = 0
+            return False
+
+    def held(self):
+        """Whether the last acquire() here took the lease and it hasn't run out yet (no query)."""
+        return time.time() < self.held_until
+
+    def release(self):
+        """Give the lease up early so another process can take it at once."""
+        self.held_until = 0
+        try:
+            with self.manager.transaction() as conn:
+                conn.execute('DELETE FROM scheduler_leases WHERE name = ? AND owner = ?',
+                             (self.name, self.owner))
+        except sqlite3.Error as e:
+            print(f"❌ Error releasing scheduler lease: {e}")
+
+
+class ReminderWatcher:
+    """
+    Feeds reminders created by another process to this process's open
+    reminder streams.
+
+    Each poll looks up unread reminders for the users with a stream open
+    here (through the per-user unread index) and pushes them via
+    aura._reminder_created, which claims them first. With no streams open
+    it doesn't touch the database at all.
+    """
+
+    def __init__(self, aura, batch_size=500):
+        self.aura = aura
+        self.batch_size = batch_size
+
+    def poll(self):
+        """Push unread reminders to users with an open stream. Returns how many were pushed."""
+        user_ids = self.aura.reminder_broker.subscribed_users()
+        pushed = 0
+
+        for start in range(0, len(user_ids), self.batch_size):
+            chunk = user_ids[start:start + self.batch_size]
+            try:
+                with self.aura.db.connection() as conn:
+                    rows = conn.execute(f'''
+                        SELECT r.id, r.user_id, r.message, r.created_at, g.goal_text
+                        FROM reminders r
+                        JOIN goals g ON g.id = r.goal_id
+                        WHERE r.user_id IN ({", ".join("?" * len(chunk))}) AND r.is_read = 0
+                        ORDER BY r.created_ts
+                    ''', chunk).fetchall()
+
+            except sqlite3.Error as e:
+                print(f"❌ Error watching for reminders: {e}")
+                return pushed
+
+            for reminder_id, user_id, message, created_at, goal_text in rows:
+                self.aura.for_user(user_id)._reminder_created(reminder_id, message, created_at, goal_text)
+                pushed += 1
+
+        return pushed
+
+
+def run_due_reminders(aura, lease):
+    """Create due reminders if this process holds the lease. Returns the count, or None if not."""
+    if not lease.acquire():
+        return None
+    return aura.create_due_reminders()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run AURA's reminder scheduler as its own process")
+    parser.add_argument('--interval', type=float, default=JOB_INTERVAL, help="Seconds between runs")
+    parser.add_argument('--db', default='aura_memory.db', help="Database file")
+    args = parser.parse_args()
+
+    aura = AURA(db_name=args.db)
+    lease = SchedulerLease(aura.db, 'reminders', ttl=max(LEASE_TTL, args.interval * 2.5))
+    print(f"📅 Reminder scheduler running as {lease.owner} (every {args.interval:g}s)")
+
+    leading = None
+    try:
+        while True:
+            created = run_due_reminders(aura, lease)
+            if (created is not None) != leading:
+                leading = created is not None
+                print("▶️  Holding the scheduler lease" if leading
+                      else "⏸️  Another process holds the scheduler lease; standing by")
+            if created:
+                print(f"🔔 Created {created} scheduled reminder(s)!")
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\n👋 Stopping scheduler")
+    finally:
+        lease.release()
+        aura.close()
+
+
+if __name__ == '__main__':
+    main()
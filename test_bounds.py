@@ -0,0 +1,57 @@
+"""
+Regression tests for out-of-range start/end bounds, which must be rejected
+with a 400 rather than escaping as OverflowError (a 500).
+
+Run with: python -m pytest test_bounds.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.append('.')
+
+# The app opens its database on import; keep it off ./aura_memory.db
+os.environ['AURA_DB'] = os.path.join(tempfile.mkdtemp(), 'test_bounds.db')
+os.environ['AURA_EMBEDDED_SCHEDULER'] = '0'
+
+import app
+import asgi_app
+
+HUGE_EPOCH = '99999999999999999999'
+
+
+def asgi_request(query):
+    """A minimal request dict, as asgi_app.dispatch builds for its handlers."""
+    return {'query': {name: [value] for name, value in query.items()}, 'session': {}, 'body': b''}
+
+
+def test_api_page_rejects_huge_bound():
+    client = app.app.test_client()
+    response = client.get(f'/api/moods?start={HUGE_EPOCH}')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+    status, body = asyncio.run(asgi_app.api_page(asgi_request({'start': HUGE_EPOCH}), 'moods'))
+    assert status == 400
+    assert body['success'] is False
+
+
+def test_search_rejects_huge_bound():
+    client = app.app.test_client()
+    response = client.get(f'/search?q=happy&start={HUGE_EPOCH}')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+    status, body = asyncio.run(asgi_app.search(asgi_request({'q': 'happy', 'start': HUGE_EPOCH})))
+    assert status == 400
+    assert body['success'] is False
+
+
+def test_chat_batch_rejects_out_of_range_timestamps():
+    client = app.app.test_client()
+    for timestamp in ('0001-01-01T00:00:00+05:00', 1e20, -5):
+        response = client.post('/chat/batch', json={'messages': [{'message': 'hi', 'timestamp': timestamp}]})
+        assert response.status_code == 400
+        assert response.get_json()['error'] == "Message 0: Invalid timestamp"